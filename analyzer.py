@@ -22,6 +22,16 @@ try:
     PDF_SUPPORT = True
 except ImportError:
     PDF_SUPPORT = False
+try:
+    import ahocorasick
+    AHOCORASICK_SUPPORT = True
+except ImportError:
+    AHOCORASICK_SUPPORT = False
+try:
+    import orjson
+    ORJSON_SUPPORT = True
+except ImportError:
+    ORJSON_SUPPORT = False
 import fitz  # PyMuPDF
 import docx2txt
 import pandas as pd
@@ -33,14 +43,41 @@ logger = logging.getLogger(__name__)
 ANALYSIS_CACHE = {}
 CACHE_TTL = 3600  # 1 час
 
+# Ключевые слова для фильтрации строк в shrink_text
+SHRINK_KEYWORDS = (
+    'техническое задание', 'тз', 'требован', 'услов', 'позици', 'товар', 'таблиц',
+    'гост', 'ту', 'фасов', 'упаков', 'объем', 'количеств', 'цена', 'стоим', 'срок',
+    'описание', 'предмет', 'контракт', 'поставка', 'лот', 'участник', 'заказчик', 'реестровый номер'
+)
+
+# Автомат Ахо-Корасик ищет все ключевые слова за один проход по строке
+if AHOCORASICK_SUPPORT:
+    _KW_AUTOMATON = ahocorasick.Automaton()
+    for _kw in SHRINK_KEYWORDS:
+        _KW_AUTOMATON.add_word(_kw, _kw)
+    _KW_AUTOMATON.make_automaton()
+
+def _has_keyword(line: str) -> bool:
+    """Проверяет, содержит ли строка (в нижнем регистре) хотя бы одно ключевое слово"""
+    if AHOCORASICK_SUPPORT:
+        return next(_KW_AUTOMATON.iter(line), None) is not None
+    return any(kw in line for kw in SHRINK_KEYWORDS)
+
 # Fallback модели при ошибках
 FALLBACK_MODELS = ['gpt-3.5-turbo', 'gpt-4o-mini', 'gpt-4']
 
 def get_cache_key(tender_info: Dict, downloaded_files: List[Dict]) -> str:
     """Генерирует ключ кэша для анализа"""
-    tender_str = json.dumps(tender_info, sort_keys=True)
-    files_str = json.dumps([f.get('path', '') for f in downloaded_files], sort_keys=True)
-    return hashlib.md5((tender_str + files_str).encode()).hexdigest()
+    # BLAKE2b быстрее MD5, а данные подаются в хэш по частям без промежуточной строки
+    h = hashlib.blake2b(digest_size=16)
+    if ORJSON_SUPPORT:
+        h.update(orjson.dumps(tender_info, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS))
+    else:
+        h.update(json.dumps(tender_info, sort_keys=True, separators=(',', ':')).encode())
+    for f in downloaded_files:
+        h.update(b'\0')
+        h.update(f.get('path', '').encode())
+    return h.hexdigest()
 
 def get_cached_analysis(cache_key: str) -> Optional[Dict]:
     """Получает результат анализа из кэша"""
@@ -224,26 +261,9 @@ class DocumentAnalyzer:
                 import aiofiles
                 async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                     return await f.read()
-            elif ext == '.docx':
-                return docx2txt.process(str(file_path))
-            elif ext == '.doc':
-                import subprocess
-                result = subprocess.run(['antiword', str(file_path)], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                return result.stdout.decode('utf-8', errors='ignore')
-            elif ext == '.pdf':
-                text = ""
-                with fitz.open(str(file_path)) as doc:
-                    for page in doc:
-                        text += page.get_text()
-                return text
-            elif ext in ['.xls', '.xlsx']:
-                df = pd.read_excel(str(file_path), dtype=str, engine='openpyxl' if ext == '.xlsx' else None)
-                return df.to_string(index=False)
-            elif ext in ['.jpg', '.jpeg', '.png']:
-                from PIL import Image
-                import pytesseract
-                img = Image.open(file_path)
-                return pytesseract.image_to_string(img, lang='rus+eng')
+            elif ext in ('.docx', '.doc', '.pdf', '.xls', '.xlsx', '.jpg', '.jpeg', '.png'):
+                # Парсинг CPU-емкий и синхронный — выполняем в пуле потоков, чтобы не блокировать event loop
+                return await asyncio.get_event_loop().run_in_executor(None, self._parse_document_sync, file_path, ext)
             elif ext == '.zip':
                 import zipfile, tempfile
                 texts = []
@@ -278,6 +298,27 @@ class DocumentAnalyzer:
             logger.error(f'[extract_text_from_file] ❌ Ошибка чтения {file_path}: {e}')
             return None
     
+    def _parse_document_sync(self, file_path: Path, ext: str) -> Optional[str]:
+        """Синхронный разбор документов (PDF, DOC/DOCX, XLS/XLSX, изображения)"""
+        if ext == '.docx':
+            return docx2txt.process(str(file_path))
+        elif ext == '.doc':
+            import subprocess
+            result = subprocess.run(['antiword', str(file_path)], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            return result.stdout.decode('utf-8', errors='ignore')
+        elif ext == '.pdf':
+            with fitz.open(str(file_path)) as doc:
+                return "".join(page.get_text() for page in doc)
+        elif ext in ('.xls', '.xlsx'):
+            df = pd.read_excel(str(file_path), dtype=str, engine='openpyxl' if ext == '.xlsx' else None)
+            return df.to_string(index=False)
+        elif ext in ('.jpg', '.jpeg', '.png'):
+            from PIL import Image
+            import pytesseract
+            img = Image.open(file_path)
+            return pytesseract.image_to_string(img, lang='rus+eng')
+        return None
+    
     def cleanup_text(self, text: str) -> str:
         """Удаляет мусор: футеры, даты, повторяющиеся заголовки и т.п."""
         import re
@@ -449,18 +490,12 @@ def shrink_text(text: str, max_len: int = 15000) -> str:
     lines = text.splitlines()
     # Удаляем пустые строки и длинные заголовки
     lines = [line.strip() for line in lines if line.strip() and len(line.strip()) < 120]
-    # Ключевые слова для фильтрации
-    keywords = [
-        'техническое задание', 'тз', 'требован', 'услов', 'позици', 'товар', 'таблиц',
-        'гост', 'ту', 'фасов', 'упаков', 'объем', 'количеств', 'цена', 'стоим', 'срок',
-        'описание', 'предмет', 'контракт', 'поставка', 'лот', 'участник', 'заказчик', 'реестровый номер'
-    ]
     # Оставляем строки с ключевыми словами или таблицы (простая эвристика: много ; или | или табуляций)
     filtered = []
     seen = set()
     for line in lines:
         l = line.lower()
-        if any(kw in l for kw in keywords) or l.count(';') > 2 or l.count('|') > 2 or l.count('\t') > 2:
+        if _has_keyword(l) or l.count(';') > 2 or l.count('|') > 2 or l.count('\t') > 2:
             if l not in seen:
                 filtered.append(line)
                 seen.add(l)
@@ -4,9 +4,11 @@ import asyncio
 from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
-    ApplicationBuilder, ContextTypes, MessageHandler, CommandHandler,
+    ApplicationBuilder, ContextTypes, MessageHandler,
     CallbackQueryHandler, filters
 )
+from telegram.error import TelegramError, NetworkError, RetryAfter, BadRequest
+from telegram.request import HTTPXRequest
 from config import TELEGRAM_TOKEN, LOG_LEVEL, LOG_FILE, OPENAI_API_KEY, OPENAI_MODEL
 from downloader import downloader
 from analyzer import analyzer
@@ -15,8 +17,6 @@ from tender_history import TenderHistoryAnalyzer
 from fssp_api import fssp_client
 import os
 import re
-import zipfile
-import tempfile
 import json
 import openai
 from typing import Optional, Dict, Any, Callable, Union, List
@@ -25,9 +25,20 @@ try:
 except ImportError:
     httpx = None
 try:
-    from bs4 import BeautifulSoup
+    import orjson
+    ORJSON_SUPPORT = True
 except ImportError:
-    BeautifulSoup = None
+    ORJSON_SUPPORT = False
+try:
+    import diskcache
+    DISKCACHE_SUPPORT = True
+except ImportError:
+    DISKCACHE_SUPPORT = False
+try:
+    import h2  # noqa: F401 - нужен httpx для HTTP/2
+    HTTP2_SUPPORT = True
+except ImportError:
+    HTTP2_SUPPORT = False
 from exportbase_api import get_company_by_inn
 from email_generator import generate_supplier_email
 from keyboards import (
@@ -35,7 +46,12 @@ from keyboards import (
     analytics_keyboard, profile_keyboard, help_keyboard, locked_keyboard,
     analyze_suggest_keyboard, supplier_suggest_keyboard, search_suggest_keyboard,
     back_to_menu_keyboard, BACK_CB, analytics_suggest_keyboard, profile_suggest_keyboard,
-    email_suggest_keyboard, history_keyboard, HISTORY_REPEAT_CB
+    email_suggest_keyboard, history_keyboard, HISTORY_REPEAT_CB,
+    tender_actions_keyboard, back_to_main_keyboard, supplier_check_keyboard, inn_check_back_keyboard,
+    buy_subscription_keyboard, extend_subscription_keyboard, referral_keyboard,
+    back_to_profile_keyboard, back_to_extend_keyboard, analysis_actions_keyboard,
+    admin_panel_keyboard, admin_users_keyboard, admin_statistics_keyboard,
+    admin_settings_keyboard, admin_logs_keyboard
 )
 from texts import (
     welcome_text, analyze_tender_text, search_tender_text, check_company_text,
@@ -45,19 +61,25 @@ from texts import (
     suggest_supplier_check_text, suggest_tender_search_text, suggest_analyze_text,
     back_to_menu_text, success_analytics_text, success_profile_text, success_email_text,
     analytics_invalid_text, profile_invalid_text, email_invalid_text,
-    tooltip_first_start, tooltip_error_repeat
+    tooltip_first_start, tooltip_error_repeat,
+    start_text, help_command_text, status_text_template,
+    buy_subscription_text, contact_support_text, pay_from_balance_text,
+    admin_panel_text, admin_settings_text, extend_subscription_text_template,
+    referral_text_template, share_ref_link_text_template, ref_statistics_text_template
 )
 from states import BotState
 from utils.validators import is_valid_inn, is_valid_tender_number, is_valid_keywords, extract_tender_number
 import importlib
-company_handlers = importlib.import_module('handlers.company_handlers')
-analyze_handlers = importlib.import_module('handlers.analyze_handlers')
-history_handlers = importlib.import_module('handlers.history_handlers')
 from tenderguru_api import TenderGuruAPI, TENDERGURU_API_CODE, format_tender_history
 import functools
+import hashlib
+import html
+import random
 import time
-from handlers.analyze_handlers import handle_tender_card_callback
-from handlers.history_handlers import analyze_found_tender_callback
+from collections import defaultdict, deque, OrderedDict
+from itertools import islice
+from types import MappingProxyType
+from concurrent.futures import ThreadPoolExecutor
 
 # Настройка логирования
 logging.basicConfig(
@@ -70,29 +92,193 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def _lazy_handler(module_name: str, func_name: str) -> Callable:
+    """Обработчик из модуля handlers.*, который импортируется при первом вызове:
+    модули разделов и их зависимости (профиль компании, арбитраж, ФССП) не грузятся при старте"""
+    async def handler(*args, **kwargs):
+        return await getattr(importlib.import_module(module_name), func_name)(*args, **kwargs)
+    handler.__name__ = func_name
+    return handler
+
+check_company_handler = _lazy_handler('handlers.company_handlers', 'check_company_handler')
+analyze_tender_handler = _lazy_handler('handlers.analyze_handlers', 'analyze_tender_handler')
+history_handler = _lazy_handler('handlers.history_handlers', 'history_handler')
+handle_tender_card_callback = _lazy_handler('handlers.analyze_handlers', 'handle_tender_card_callback')
+analyze_found_tender_callback = _lazy_handler('handlers.history_handlers', 'analyze_found_tender_callback')
+
 # Кэш для результатов анализа
-ANALYSIS_CACHE = {}
 CACHE_TTL = 3600  # 1 час
+ANALYSIS_CACHE_MAXSIZE = 100
+ANALYSIS_CACHE_SWEEP_INTERVAL = 300  # секунды между очистками устаревших записей
+# Каталог и лимит дискового кэша анализа (используется, если установлен diskcache)
+ANALYSIS_CACHE_DIR = os.environ.get('ANALYSIS_CACHE_DIR', 'analysis_cache')
+ANALYSIS_CACHE_SIZE_LIMIT = 2 ** 30  # 1 ГБ
+
+# Сессии пользователей без активности дольше SESSION_TTL удаляются целиком,
+# а тяжелые данные тендера (SESSION_HEAVY_FIELDS) — уже через SESSION_DATA_TTL
+SESSION_TTL = 86400  # секунды
+SESSION_DATA_TTL = 3600  # секунды
+SESSION_MAXSIZE = 10000
+SESSION_HEAVY_FIELDS = ('tender_data', 'tender_view', 'formatted_info', 'files')
+SESSION_EVICT_EVERY = 100  # проверка устаревших сессий раз в N обращений
+# Время жизни данных личного кабинета (подписка, баланс) в кэше, секунды
+USER_INFO_TTL = 30
+# Кэш результатов проверки контрагентов по (тип проверки, ИНН), секунды;
+# данные ФССП обновляются чаще, поэтому живут меньше
+CHECK_CACHE_TTL = 900
+FSSP_CHECK_CACHE_TTL = 300
+CHECK_CACHE_MAXSIZE = 1000
+
+# Размер кэша отрисованных страниц документов
+DOCS_CACHE_MAXSIZE = 512
+# Начиная с какого числа документов страница строится в пуле потоков
+DOCS_OFFLOAD_THRESHOLD = 200
+
+# Одновременных анализов документов через OpenAI
+OPENAI_MAX_CONCURRENCY = 8
+
+# Размер общего пула потоков для run_in_executor (OpenAI, парсинг документов, ExportBase)
+EXECUTOR_MAX_WORKERS = 8
+
+# Ограничение исходящих запросов к Telegram (лимит API ~30 сообщений/сек на бота)
+TELEGRAM_RATE_LIMIT = 25  # сообщений
+TELEGRAM_RATE_PERIOD = 1.0  # секунды
+# Размер пула HTTP-соединений к Bot API (по умолчанию в PTB — 1)
+TELEGRAM_POOL_SIZE = 64
+# Таймауты запросов к Bot API (секунды); pool — ожидание свободного соединения из пула
+TELEGRAM_CONNECT_TIMEOUT = 10.0
+TELEGRAM_READ_TIMEOUT = 20.0
+TELEGRAM_WRITE_TIMEOUT = 20.0
+TELEGRAM_POOL_TIMEOUT = 10.0
+# Очереди исходящих запросов к Telegram: по одной на обработчик, запросы одного
+# чата всегда попадают в одну очередь и уходят в порядке постановки
+SEND_QUEUE_MAXSIZE = 1000
+SEND_WORKERS = 4
+# Необработанных сообщений в очереди одного чата; сверх лимита новые отбрасываются
+CHAT_QUEUE_MAXSIZE = 20
+
+# Webhook: Telegram сам присылает обновления вместо опроса getUpdates.
+# Если WEBHOOK_HOST не задан, бот работает через long-polling (локальный запуск)
+WEBHOOK_HOST = os.environ.get('WEBHOOK_HOST', '')
+WEBHOOK_PORT = int(os.environ.get('WEBHOOK_PORT', '8443'))
+WEBHOOK_LISTEN = os.environ.get('WEBHOOK_LISTEN', '0.0.0.0')
+# Секрет из заголовка X-Telegram-Bot-Api-Secret-Token: запросы без него отклоняются
+WEBHOOK_SECRET = os.environ.get('WEBHOOK_SECRET') or None
+
+# Окно склейки быстрых нажатий на кнопки листания документов
+PAGINATION_DEBOUNCE = 0.15  # секунды
+
+# Длина части анализа до экранирования (запас под HTML-сущности до лимита Telegram 4096)
+ANALYSIS_CHUNK_SIZE = 3500
 
 # Retry настройки
 MAX_RETRIES = 3
 RETRY_DELAY = 1  # секунды
 
+# Регулярные выражения, компилируемые один раз при загрузке модуля
+_NON_DIGITS_RE = re.compile(r'\D')
+_SEARCH_QUERIES_RE = re.compile(r'Поисковые запросы\s*:?', re.IGNORECASE)
+
+# Таблица экранирования Markdown для str.translate: один проход по строке на C
+_MD_TABLE = str.maketrans({c: f'\\{c}' for c in '_*[]()~`>#+-=|{}.!'})
+
 def escape_markdown(text: str) -> str:
     """Экранирует специальные символы Markdown для Telegram"""
     if not text:
         return text
+    return text.translate(_MD_TABLE)
+
+# То же для legacy Markdown (parse_mode='Markdown'): служебные только * _ ` [ ]
+_MD_LEGACY_TABLE = str.maketrans({c: f'\\{c}' for c in '*_`[]'})
+
+class OrjsonHTTPXRequest(HTTPXRequest):
+    """HTTPX-бэкенд PTB, разбирающий ответы Telegram через orjson"""
     
-    # Символы, которые нужно экранировать в Markdown
-    escape_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-    
-    for char in escape_chars:
-        text = text.replace(char, f'\\{char}')
-    
-    return text
+    @staticmethod
+    def parse_json_payload(payload: bytes) -> dict:
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError as exc:
+            raise TelegramError("Invalid server response") from exc
+
+class AsyncRateLimiter:
+    """Token bucket для ограничения частоты исходящих запросов"""
+
+    def __init__(self, rate: int = TELEGRAM_RATE_LIMIT, period: float = TELEGRAM_RATE_PERIOD):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        # До этого момента (time.monotonic) все отправки ждут: Telegram ответил 429
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов на время, запрошенное сервером"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Ждет, пока в ведре появится свободный токен"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+# Временные ошибки, после которых имеет смысл повторить запрос
+RETRYABLE_EXCEPTIONS = tuple(exc for exc in (
+    asyncio.TimeoutError,
+    ConnectionError,
+    NetworkError,
+    RetryAfter,
+    httpx.HTTPError if httpx else None,
+    getattr(openai, 'APIConnectionError', None),
+    getattr(openai, 'APITimeoutError', None),
+    getattr(openai, 'RateLimitError', None),
+    getattr(openai, 'InternalServerError', None),
+) if exc is not None)
+
+def _send_chat_id(method: Callable, kwargs: dict) -> Optional[int]:
+    """Чат, в который уходит запрос: chat_id из аргументов или из объекта,
+    чей метод вызывается (Message.reply_text, CallbackQuery.edit_message_text)"""
+    chat_id = kwargs.get('chat_id')
+    if chat_id is not None:
+        return chat_id
+    owner = getattr(method, '__self__', None)
+    chat_id = getattr(owner, 'chat_id', None)
+    if chat_id is None:
+        chat_id = getattr(getattr(owner, 'message', None), 'chat_id', None)
+    return chat_id
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    """Пауза, которую просит сервер (Telegram RetryAfter или заголовок Retry-After)"""
+    if isinstance(error, RetryAfter):
+        retry_after = error.retry_after
+        return retry_after.total_seconds() if hasattr(retry_after, 'total_seconds') else float(retry_after)
+    response = getattr(error, 'response', None)
+    header = getattr(response, 'headers', {}).get('retry-after') if response is not None else None
+    try:
+        return float(header) if header else None
+    except ValueError:
+        return None
 
-def retry_on_error(max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY):
-    """Декоратор для retry-логики"""
+def retry_on_error(max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY,
+                   retry_on: tuple = RETRYABLE_EXCEPTIONS):
+    """Декоратор для retry-логики: повторяет только временные ошибки из retry_on"""
     def decorator(func):
         @functools.wraps(func)
         async def wrapper(*args, **kwargs):
@@ -100,38 +286,152 @@ def retry_on_error(max_retries: int = MAX_RETRIES, delay: float = RETRY_DELAY):
             for attempt in range(max_retries):
                 try:
                     return await func(*args, **kwargs)
-                except Exception as e:
+                except retry_on as e:
                     last_exception = e
                     logger.warning(f"[retry] Попытка {attempt + 1}/{max_retries} не удалась: {e}")
                     if attempt < max_retries - 1:
-                        await asyncio.sleep(delay * (2 ** attempt))  # Экспоненциальная задержка
+                        # Экспоненциальная задержка с джиттером, если сервер не указал свою
+                        pause = _retry_after_seconds(e)
+                        if pause is None:
+                            pause = delay * (2 ** attempt) * (0.5 + random.random())
+                        await asyncio.sleep(pause)
             logger.error(f"[retry] Все попытки исчерпаны: {last_exception}")
             raise last_exception
         return wrapper
     return decorator
 
+def _analysis_header(part: int, total: int) -> str:
+    """Заголовок для части анализа при разбиении на сообщения (HTML)"""
+    if total == 1:
+        return "🤖 <b>Анализ тендера:</b>\n\n"
+    if part == 1:
+        return f"🤖 <b>Анализ тендера</b> (часть {part}/{total}):\n\n"
+    return f"🤖 <b>Продолжение анализа</b> (часть {part}/{total}):\n\n"
+
+_MD_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+
+def _summary_to_html(text: str) -> str:
+    """Экранирует текст GPT для parse_mode='HTML', сохраняя выделение **жирным**.
+    В отличие от legacy Markdown, непарные * и _ не ломают отправку."""
+    return _MD_BOLD_RE.sub(r'<b>\1</b>', html.escape(text, quote=False))
+
+def _chunk_text(text: str, max_length: int):
+    """Разбивает текст на части не длиннее max_length по границам строк за один проход.
+    Строка длиннее max_length режется на куски."""
+    buf = []
+    cur_len = 0
+    for line in text.split('\n'):
+        while len(line) > max_length:
+            if buf:
+                yield '\n'.join(buf).strip()
+                buf, cur_len = [], 0
+            yield line[:max_length]
+            line = line[max_length:]
+        if buf and cur_len + 1 + len(line) > max_length:
+            yield '\n'.join(buf).strip()
+            buf, cur_len = [], 0
+        cur_len += len(line) + 1 if buf else len(line)
+        buf.append(line)
+    if buf:
+        chunk = '\n'.join(buf).strip()
+        if chunk:
+            yield chunk
+
+async def _send_chunked(send: Callable, text: str, size: int = 4000,
+                        header_fmt: Callable[[int, int], str] = _analysis_header,
+                        escape: Optional[Callable[[str], str]] = None, **kwargs) -> None:
+    """Отправляет длинный текст частями по границам строк.
+    escape применяется к каждой части после разбиения, чтобы не разрезать сущности."""
+    parts = list(_chunk_text(text, size)) or ['']
+    total = len(parts)
+    for i, part in enumerate(parts, 1):
+        await send(text=header_fmt(i, total) + (escape(part) if escape else part), **kwargs)
+
+_blake2b = hashlib.blake2b
+
+if ORJSON_SUPPORT:
+    _ORJSON_KEY_OPTS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+
+    def _canonical_json(data) -> bytes:
+        """Канонический JSON (с отсортированными ключами) в байтах для хэширования"""
+        return orjson.dumps(data, option=_ORJSON_KEY_OPTS)
+else:
+    def _canonical_json(data) -> bytes:
+        """Канонический JSON (с отсортированными ключами) в байтах для хэширования"""
+        return json.dumps(data, sort_keys=True, separators=(',', ':')).encode()
+
 def get_cache_key(tender_data: Dict, files: list) -> str:
     """Генерирует ключ кэша для анализа"""
-    import hashlib
-    tender_str = json.dumps(tender_data, sort_keys=True)
-    files_str = json.dumps([f.get('path', '') for f in files], sort_keys=True)
-    return hashlib.md5((tender_str + files_str).encode()).hexdigest()
-
-def get_cached_analysis(cache_key: str) -> Optional[Dict]:
-    """Получает результат анализа из кэша"""
-    if cache_key in ANALYSIS_CACHE:
-        timestamp, result = ANALYSIS_CACHE[cache_key]
-        if time.time() - timestamp < CACHE_TTL:
-            logger.info(f"[cache] Найден кэшированный результат для {cache_key}")
-            return result
-        else:
-            del ANALYSIS_CACHE[cache_key]
-    return None
+    # BLAKE2b быстрее MD5, а данные подаются в хэш по частям без промежуточной строки
+    h = _blake2b(digest_size=16)
+    h.update(_canonical_json(tender_data))
+    for f in files:
+        h.update(b'\0')
+        h.update(f.get('path', '').encode())
+    return h.hexdigest()
+
+class AnalysisCache:
+    """LRU-кэш результатов анализа с ограничением размера и временем жизни записей"""
+    
+    # Операции в памяти, выполняются прямо в event loop
+    BLOCKING = False
+    
+    def __init__(self, maxsize: int = ANALYSIS_CACHE_MAXSIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.cache: OrderedDict = OrderedDict()
+    
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self.cache.get(key)
+        if entry is None:
+            return None
+        timestamp, result = entry
+        if time.time() - timestamp >= self.ttl:
+            del self.cache[key]
+            return None
+        self.cache.move_to_end(key)
+        return result
+    
+    def set(self, key: str, result: Dict) -> None:
+        if key in self.cache:
+            self.cache.move_to_end(key)
+        elif len(self.cache) >= self.maxsize:
+            self.cache.popitem(last=False)
+        self.cache[key] = (time.time(), result)
+    
+    def cleanup_expired(self) -> int:
+        """Удаляет устаревшие записи за один проход, возвращает их число"""
+        deadline = time.time() - self.ttl
+        expired = [key for key, (timestamp, _) in self.cache.items() if timestamp <= deadline]
+        for key in expired:
+            del self.cache[key]
+        return len(expired)
+    
+    def __len__(self) -> int:
+        return len(self.cache)
 
-def cache_analysis_result(cache_key: str, result: Dict):
-    """Сохраняет результат анализа в кэш"""
-    ANALYSIS_CACHE[cache_key] = (time.time(), result)
-    logger.info(f"[cache] Результат сохранен в кэш: {cache_key}")
+class DiskAnalysisCache:
+    """Кэш результатов анализа на диске (diskcache/SQLite): переживает перезапуск бота,
+    чтобы повторный анализ тех же документов не шел заново в OpenAI"""
+    
+    # Обращения к SQLite блокируют поток: из асинхронного кода — только через пул потоков
+    BLOCKING = True
+    
+    def __init__(self, directory: str = ANALYSIS_CACHE_DIR, ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        self.cache = diskcache.Cache(directory, size_limit=ANALYSIS_CACHE_SIZE_LIMIT)
+    
+    def get(self, key: str) -> Optional[Dict]:
+        return self.cache.get(key)
+    
+    def set(self, key: str, result: Dict) -> None:
+        self.cache.set(key, result, expire=self.ttl)
+    
+    def cleanup_expired(self) -> int:
+        return self.cache.expire()
+    
+    def __len__(self) -> int:
+        return len(self.cache)
 
 def safe_get_message(update: Update) -> Optional[Any]:
     """Безопасно получает сообщение из update"""
@@ -167,34 +467,145 @@ async def handle_session_error(query, error_msg: str = "❌ Данные тен
     except Exception as e:
         logger.warning(f"[bot] Не удалось отправить сообщение об ошибке: {e}")
 
-EXCLUDE_DOMAINS = [
+# Множества для проверки вхождения за O(1)
+EXCLUDE_DOMAINS = frozenset({
     "avito.ru", "wildberries.ru", "ozon.ru", "market.yandex.ru", "lavka.yandex.ru",
     "beru.ru", "goods.ru", "tmall.ru", "aliexpress.ru",
     "youtube.com", "youtu.be", "rutube.ru",
     "consultant.ru"
-]
-EXCLUDE_PATTERNS = ["gost", "wiki", "gos", ".edu", ".gov"]
-EXCLUDE_MINUS_WORDS = ["гост", "википедия", "техусловия", "норматив", "техзадание"]
-EXCLUDE_HTML = [
+})
+EXCLUDE_PATTERNS = frozenset({"gost", "wiki", "gos", ".edu", ".gov"})
+EXCLUDE_MINUS_WORDS = frozenset({"гост", "википедия", "техусловия", "норматив", "техзадание"})
+EXCLUDE_HTML = frozenset({
     'tender', 'zakupka', 'zakupki', 'тендер', 'закупка', 'видео',
     *EXCLUDE_MINUS_WORDS
-]
+})
+
+# Шаблоны заголовка и карточки товарной позиции в списке с пагинацией
+PRODUCTS_HEADER_TEMPLATE = "📦 <b>Товарные позиции</b> (страница {page} из {total}):\n\n"
+PRODUCT_CARD_TEMPLATE = (
+    "{idx}. <b>{name}</b>\n"
+    "   📊 Количество: {qty} {unit}\n"
+    "   💰 Цена за единицу: {price} руб.\n"
+    "   💵 Общая стоимость: {cost} руб.\n"
+    "{extras}\n"
+)
+
+# Шаблон подробной информации о тендере (заполняется через format_map)
+DETAILED_INFO_TEMPLATE = """
+🏢 <b>Подробная информация о тендере</b>
+
+🔍 <b>Детали закупки:</b>
+• <b>Способ закупки:</b> {procurement_type}
+• <b>Место поставки:</b> {delivery_place}
+• <b>Срок поставки:</b> {delivery_terms}
+• <b>Обеспечение заявки:</b> {guarantee_amount}
+• <b>Источник финансирования:</b> {funding_source}
+
+🌍 <b>Региональная информация:</b>
+• <b>Регион:</b> {region}
+• <b>Федеральный закон:</b> {federal_law}-ФЗ
+
+🏢 <b>Электронная торговая площадка:</b>
+• <b>Название:</b> {etp_name}
+• <b>Сайт:</b> {etp_url}
+
+📞 <b>Контактная информация:</b>
+• <b>Ответственное лицо:</b> {contact_person}
+• <b>Телефон:</b> {contact_phone}
+• <b>Email:</b> {contact_email}
+
+💳 <b>Финансовые детали:</b>
+• <b>ИКЗ:</b> {ikz}
+• <b>Аванс:</b> {advance_percent}%
+• <b>Обеспечение исполнения:</b> {execution_amount}
+• <b>Банковское сопровождение:</b> {bank_support}
+        """
+
+# Русские названия моделей скоринга
+SCORING_MODEL_NAMES = MappingProxyType({
+    '_bankrots2016': 'Риск банкротства (2016)',
+    '_tech': 'Технический скоринг',
+    '_diskf': 'Дискриминантный анализ',
+    '_problemCredit': 'Проблемные кредиты',
+    '_zsk': 'Защита от кредитных рисков',
+    'financial_coefficients': 'Финансовые коэффициенты'
+})
+
+# Ключевые финансовые коэффициенты скоринга с их названиями и типами
+SCORING_KEY_COEFS = MappingProxyType({
+    'КоэфТекЛикв': MappingProxyType({'name': 'Текущая ликвидность', 'type': 'ratio', 'unit': ''}),
+    'РентАктивов': MappingProxyType({'name': 'Рентабельность активов', 'type': 'percent', 'unit': '%'}),
+    'КоэфФинАвт': MappingProxyType({'name': 'Финансовая автономия', 'type': 'ratio', 'unit': ''}),
+    'РентПродаж': MappingProxyType({'name': 'Рентабельность продаж', 'type': 'percent', 'unit': '%'})
+})
+
+# Эмодзи уровня риска в результатах скоринга
+_RISK_EMOJI = MappingProxyType({'low': '🟢', 'medium': '🟡', 'high': '🔴'})
+
+# Оценка коэффициента относительно нормы: один проход регулярным выражением
+_NORM_RE = re.compile(r"(выше|ниже|в пределах) нормы", re.I)
+_NORM_EMOJI = MappingProxyType({'выше': '✅', 'ниже': '⚠️', 'в пределах': '🟢'})
+
+def _arbitr_found(cases_data: dict) -> str:
+    # Всегда используем форматированный вывод
+    return arbitr_api.format_arbitrage_summary(cases_data)
+
+def _arbitr_not_found(cases_data: dict) -> str:
+    return ("✅ **Арбитражные дела не найдены**\n\n"
+            "💡 *Это означает, что компания не участвовала в арбитражных спорах, что является положительным фактором.*")
+
+def _arbitr_error(cases_data: dict) -> str:
+    error_msg = cases_data.get('error', 'Неизвестная ошибка')
+    return f"❌ **Ошибка при получении данных:** {error_msg}"
+
+def _arbitr_unknown(cases_data: dict) -> str:
+    return "❌ **Не удалось получить данные об арбитражных делах**"
+
+# Форматирование ответа арбитражного API по его статусу
+_ARBITR_HANDLERS = MappingProxyType({
+    'found': _arbitr_found,
+    'not_found': _arbitr_not_found,
+    'error': _arbitr_error,
+})
+
+class _FormatDefaults(dict):
+    """Словарь для str.format_map: отсутствующие поля выводятся как «—»"""
+    def __missing__(self, key):
+        return "—"
+
+_THOUSANDS_TABLE = str.maketrans(',', ' ')
+
+def _format_price_num(num) -> str:
+    return f"{num:,}".translate(_THOUSANDS_TABLE) + " рублей"
+
+def _money(value) -> str:
+    """Сумма ФССП: числа с разделителями разрядов и копейками, остальное как есть"""
+    if isinstance(value, (int, float)):
+        return format(value, ',.2f')
+    return str(value)
+
+def _format_price_str(price_raw: str) -> str:
+    # Если строка, пробуем отделить число и валюту
+    parts = price_raw.split(maxsplit=1)
+    if not parts:
+        return price_raw
+    try:
+        num = float(parts[0]) if '.' in parts[0] else int(parts[0])
+    except ValueError:
+        # Если не удалось, возвращаем как есть
+        return price_raw
+    return _format_price_num(num)
+
+_PRICE_FORMATTERS = {str: _format_price_str, int: _format_price_num, float: _format_price_num}
 
 def format_price(price_raw):
     """Форматирует цену с пробелами и заменяет валюту на 'рублей'"""
-    if isinstance(price_raw, str):
-        # Если строка, пробуем отделить число и валюту
-        parts = price_raw.split()
-        if parts and parts[0].replace('.', '', 1).isdigit():
-            num = float(parts[0]) if '.' in parts[0] else int(parts[0])
-            formatted = f"{num:,}".replace(",", " ")
-            return f"{formatted} рублей"
-        else:
-            # Если не удалось, возвращаем как есть
-            return price_raw
-    elif isinstance(price_raw, (int, float)):
-        return f"{price_raw:,}".replace(",", " ") + " рублей"
-    return str(price_raw)
+    return _PRICE_FORMATTERS.get(type(price_raw), str)(price_raw)
+
+# Названия месяцев в родительном падеже, индекс — номер месяца
+_MONTHS = ('', 'января', 'февраля', 'марта', 'апреля', 'мая', 'июня',
+           'июля', 'августа', 'сентября', 'октября', 'ноября', 'декабря')
 
 def format_date(date_str):
     """Преобразует дату из формата YYYY-MM-DD в "Дата месяц год" на русском языке"""
@@ -202,30 +613,10 @@ def format_date(date_str):
         return 'Не указана'
     
     try:
-        # Словарь месяцев на русском языке
-        months = {
-            '01': 'января', '02': 'февраля', '03': 'марта', '04': 'апреля',
-            '05': 'мая', '06': 'июня', '07': 'июля', '08': 'августа',
-            '09': 'сентября', '10': 'октября', '11': 'ноября', '12': 'декабря'
-        }
-        
-        # Разбираем дату
-        parts = date_str.split('-')
-        if len(parts) == 3:
-            year = parts[0]
-            month = parts[1]
-            day = parts[2]
-            
-            # Убираем ведущий ноль из дня
-            day = str(int(day))
-            
-            # Получаем название месяца
-            month_name = months.get(month, month)
-            
-            return f"{day} {month_name} {year}"
-        
-        return date_str
-    except Exception:
+        year, month, day = date_str.split('-')
+        # int() убирает ведущий ноль из дня; номер месяца вне 1..12 даст IndexError
+        return f"{int(day)} {_MONTHS[int(month) or 13]} {year}"
+    except (ValueError, IndexError, AttributeError):
         return date_str
 
 def format_phone(phone_raw):
@@ -234,7 +625,7 @@ def format_phone(phone_raw):
         return 'Не указан'
     
     # Убираем все нецифровые символы
-    digits = re.sub(r'\D', '', str(phone_raw))
+    digits = _NON_DIGITS_RE.sub('', str(phone_raw))
     
     # Если номер начинается с 7 и имеет 11 цифр
     if digits.startswith('7') and len(digits) == 11:
@@ -255,11 +646,274 @@ def format_phone(phone_raw):
     # Если ничего не подходит, возвращаем как есть
     return phone_raw
 
+def _unwrap_tender(tender_data: dict) -> dict:
+    """Распаковывает ответ вида {номер_тендера: {...}} без копирования значений в список"""
+    if tender_data and len(tender_data) == 1:
+        inner = next(iter(tender_data.values()))
+        if isinstance(inner, dict):
+            return inner
+    return tender_data
+
+def _html(text) -> str:
+    """Экранирует пользовательский текст для parse_mode='HTML'"""
+    return html.escape(str(text), quote=False)
+
+_DOWNLOAD_BTN_TEXT = "📥 Скачать документы"
+
+def _documents_columns(documents: list) -> tuple:
+    """Раскладывает список документов по колонкам: (названия, даты, числа файлов)"""
+    names, dates, files_counts = [], [], []
+    add_name, add_date, add_count = names.append, dates.append, files_counts.append
+    esc, fd = _html, format_date
+    for doc in documents:
+        get = doc.get
+        add_name(esc(get('Название', 'Без названия')))
+        date = get('ДатаРазм')
+        add_date(fd(date) if date else '')
+        add_count(len(get('Файлы', ())))
+    return tuple(names), tuple(dates), tuple(files_counts)
+
+def _tender_view(tender_data: dict) -> dict:
+    """Один раз подготавливает отображение тендера: колонки документов и
+    отформатированные (название, цена, стоимость) товарных позиций.
+    Данные тендера не меняются — они же уходят в ключ кэша и в анализ."""
+    tender_data = _unwrap_tender(tender_data or {})
+    documents = tender_data.get('Документы', [])
+    objects = tender_data.get('Продукт', {}).get('ОбъектыЗак', [])
+    esc, fp = _html, format_price
+    return {
+        'docs_columns': _documents_columns(documents) if documents else None,
+        'products': tuple(
+            (esc(obj.get('Наименование', 'Без названия')), fp(obj.get('ЦенаЕд', 0)), fp(obj.get('Стоимость', 0)))
+            for obj in objects
+        ),
+    }
+
+def _nav_row(prefix: str, page: int, total_pages: int) -> Optional[tuple]:
+    """Спецификация ряда пагинации ⬅️ / N/M / ➡️ с callback_data вида <prefix>_<страница>.
+    Возвращает None, если страница одна."""
+    if total_pages <= 1:
+        return None
+    row = []
+    if page > 0:
+        row.append(("⬅️ Назад", f"{prefix}_{page-1}"))
+    row.append((f"{page + 1}/{total_pages}", "current_page"))
+    if page < total_pages - 1:
+        row.append(("Вперед ➡️", f"{prefix}_{page+1}"))
+    return tuple(row)
+
+@functools.lru_cache(maxsize=DOCS_CACHE_MAXSIZE)
+def _render_documents_page(reg_number: str, page: int, documents: tuple) -> tuple:
+    """Отрисовывает страницу документов по снимку (названия, отформатированные даты, числа файлов).
+    Возвращает текст и спецификацию клавиатуры ((текст, callback_data), ...)."""
+    names, dates, files_counts = documents
+    # Настройки пагинации
+    items_per_page = 8
+    total_pages = (len(names) + items_per_page - 1) // items_per_page
+    start_idx = page * items_per_page
+    end_idx = min(start_idx + items_per_page, len(names))
+    
+    # Создаем список документов для текущей страницы
+    parts = [f"📄 <b>Документы тендера</b> (страница {page + 1} из {total_pages}):\n\n"]
+    
+    page_rows = zip(
+        islice(names, start_idx, end_idx),
+        islice(dates, start_idx, end_idx),
+        islice(files_counts, start_idx, end_idx),
+    )
+    for i, (name, date, files_count) in enumerate(page_rows, start_idx + 1):
+        parts.append(f"{i}. <b>{name}</b>\n")
+        if date:
+            parts.append(f"   📅 Дата: {date}\n")
+        if files_count:
+            parts.append(f"   📎 Файлов: {files_count}\n")
+        parts.append("\n")
+    
+    parts.append("💾 <b>Скачать все документы:</b>")
+    
+    # Создаем кнопки навигации и скачивания
+    keyboard = []
+    
+    # Кнопки навигации
+    nav_row = _nav_row("dp", page, total_pages)
+    if nav_row:
+        keyboard.append(nav_row)
+    
+    # Кнопка скачивания: номер тендера (до 19 символов) укладывается в лимит
+    # callback_data в 64 байта и остается верным после перезапуска бота
+    keyboard.append(((_DOWNLOAD_BTN_TEXT, f"dl_{reg_number}"),))
+    
+    return "".join(parts), tuple(keyboard)
+
+@functools.lru_cache(maxsize=DOCS_CACHE_MAXSIZE)
+def _button(text: str, callback_data: str) -> InlineKeyboardButton:
+    """Общая неизменяемая кнопка по (текст, callback_data): «Скачать документы»,
+    индикаторы страниц и кнопки навигации переиспользуются между сообщениями"""
+    return InlineKeyboardButton(text, callback_data=callback_data)
+
+@functools.lru_cache(maxsize=DOCS_CACHE_MAXSIZE)
+def _markup_from_spec(keyboard_spec: tuple) -> InlineKeyboardMarkup:
+    """Собирает InlineKeyboardMarkup из закэшированной спецификации кнопок.
+    Разметка неизменяема, поэтому одна и та же страница получает тот же объект."""
+    return InlineKeyboardMarkup([
+        [_button(text, callback_data) for text, callback_data in row]
+        for row in keyboard_spec
+    ])
+
+def _tail_lines(path: str, count: int) -> list:
+    """Возвращает последние count строк файла: файл читается потоком,
+    в памяти держится только хвост, а не весь лог"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return list(deque(f, maxlen=count))
+
 class TenderBot:
     def __init__(self):
         self.app = None
         self.user_sessions = {}  # Для хранения состояния пользователей
         self.history_analyzer = TenderHistoryAnalyzer()
+        self._send_limiter = AsyncRateLimiter()
+        self._openai_sem = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+        # Создаются в _post_init, когда уже запущен event loop
+        self._send_qs: List[asyncio.Queue] = []
+        self._analysis_cache: Optional[Union[AnalysisCache, DiskAnalysisCache]] = None
+        self._send_workers: List[asyncio.Task] = []
+        # user_id -> время последнего обращения в порядке обращений (для сессии целиком
+        # и для тяжелых данных тендера): вытеснение старых сессий за O(1), память — O(пользователей)
+        self._session_touched: OrderedDict = OrderedDict()
+        self._session_data_touched: OrderedDict = OrderedDict()
+        self._session_writes = 0
+        # Снимки документов по номеру тендера: reg_number -> (отпечаток, кортеж документов)
+        self._docs_cache: Dict[str, tuple] = {}
+        # Листание документов: последняя запрошенная страница и отложенная отрисовка
+        # по ключу (chat_id, message_id)
+        self._pending_page: Dict[tuple, tuple] = {}
+        self._debounce_tasks: Dict[tuple, asyncio.Task] = {}
+        # Отрисованные страницы товаров: (id списка, страница) -> (список, текст, разметка)
+        self._page_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Хэш последнего содержимого сообщения со списком документов по (chat_id, message_id)
+        self._last_msg: Dict[tuple, int] = {}
+        # Очереди входящих сообщений по chat_id и их обработчики (живут, пока есть сообщения)
+        self._chat_queues: Dict[int, asyncio.Queue] = {}
+        self._chat_workers: Dict[int, asyncio.Task] = {}
+        # Чаты, которым уже сообщили о переполнении очереди (сбрасывается, когда очередь разобрана)
+        self._chat_overflow_notified: set = set()
+        # Имя команды -> обработчик (заполняется в setup_handlers)
+        self._commands: Dict[str, Callable] = {}
+        # Индекс статус -> user_id сессий в этом статусе; меняется только через set_status
+        self._sessions_by_status: Dict[str, set] = defaultdict(set)
+        # Данные личного кабинета: user_id -> (время получения, user_info)
+        self._user_info_cache: Dict[int, tuple] = {}
+        # Проверки контрагентов: тип -> метод; (тип, ИНН) -> (время, текст) и выполняемые запросы
+        self._checks: Dict[str, Callable] = {
+            'fns': self._check_fns,
+            'arbitr': self._check_arbitr,
+            'scoring': self._check_scoring,
+            'fssp': self._check_fssp,
+        }
+        self._check_cache: Dict[tuple, tuple] = {}
+        self._check_inflight: Dict[tuple, asyncio.Task] = {}
+        # callback_data -> обработчик и (префикс, обработчик) для параметризованных callback'ов
+        self._callback_routes: Dict[str, Callable] = {}
+        self._callback_prefixes: tuple = ()
+    
+    def _touch_session(self, user_id: Optional[int]) -> None:
+        """Отмечает активность пользователя и периодически удаляет устаревшие сессии"""
+        if user_id is None:
+            return
+        now = time.monotonic()
+        # По одной записи на пользователя, в порядке последнего обращения
+        for touched in (self._session_touched, self._session_data_touched):
+            touched[user_id] = now
+            touched.move_to_end(user_id)
+        self._session_writes += 1
+        if self._session_writes % SESSION_EVICT_EVERY == 0:
+            self._evict_stale_sessions(now)
+    
+    def _evict_stale_sessions(self, now: float) -> None:
+        """Освобождает данные тендеров в сессиях старше SESSION_DATA_TTL, удаляет сессии
+        старше SESSION_TTL и самые старые сессии сверх SESSION_MAXSIZE"""
+        # Словари упорядочены по последнему обращению: самые старые — в начале
+        data_touched = self._session_data_touched
+        while data_touched and now - next(iter(data_touched.values())) > SESSION_DATA_TTL:
+            user_id, _ = data_touched.popitem(last=False)
+            session = self.user_sessions.get(user_id)
+            if session:
+                for field in SESSION_HEAVY_FIELDS:
+                    session.pop(field, None)
+        touched = self._session_touched
+        while touched and (now - next(iter(touched.values())) > SESSION_TTL or len(touched) > SESSION_MAXSIZE):
+            user_id, _ = touched.popitem(last=False)
+            data_touched.pop(user_id, None)
+            session = self.user_sessions.pop(user_id, None)
+            if session and session.get('status') is not None:
+                self._sessions_by_status[session['status']].discard(user_id)
+    
+    def set_status(self, user_id: int, status: str) -> None:
+        """Меняет статус сессии (создавая ее при необходимости),
+        поддерживая индекс сессий по статусам"""
+        session = self.user_sessions.setdefault(user_id, {})
+        old = session.get('status')
+        if old != status:
+            if old is not None:
+                self._sessions_by_status[old].discard(user_id)
+            self._sessions_by_status[status].add(user_id)
+            if 'completed' in (old, status):
+                # Статистика в личном кабинете строится по счетчику завершенных анализов
+                self._user_info_cache.clear()
+            else:
+                self._user_info_cache.pop(user_id, None)
+        session['status'] = status
+    
+    def _status_count(self, status: str) -> int:
+        """Число сессий в статусе status без обхода всех сессий"""
+        return len(self._sessions_by_status.get(status, ()))
+    
+    async def _limited_send(self, method: Callable, **kwargs):
+        """Вызывает метод отправки Telegram с учетом общего лимита частоты.
+        Запрос ставится в ограниченную очередь, результат возвращается вызывающему."""
+        if not self._send_qs:
+            return await self._send_now(method, kwargs)
+        future = asyncio.get_running_loop().create_future()
+        chat_id = _send_chat_id(method, kwargs)
+        send_q = self._send_qs[hash(chat_id) % len(self._send_qs)]
+        await send_q.put((method, kwargs, future))
+        return await future
+    
+    async def _send_now(self, method: Callable, kwargs: dict):
+        """Выполняет запрос под лимитером; на каждый 429 приостанавливает все отправки
+        на запрошенное Telegram время и повторяет запрос, всего до MAX_RETRIES попыток"""
+        for attempt in range(1, MAX_RETRIES + 1):
+            try:
+                async with self._send_limiter:
+                    return await method(**kwargs)
+            except RetryAfter as e:
+                if attempt == MAX_RETRIES:
+                    raise
+                retry_after = _retry_after_seconds(e)
+                logger.warning(f"[bot] Telegram просит подождать {retry_after} с (попытка {attempt}/{MAX_RETRIES})")
+                self._send_limiter.pause(retry_after)
+    
+    async def _edit_markdown(self, query, text: str, reply_markup=None):
+        """Редактирует сообщение экрана (Markdown) через общую очередь отправки:
+        правки всех обработчиков разбираются воркерами по общему пулу соединений
+        с учетом лимита Telegram и повтором при RetryAfter"""
+        return await self._limited_send(
+            query.edit_message_text, text=text, parse_mode='Markdown', reply_markup=reply_markup
+        )
+    
+    async def _send_worker(self, send_q: asyncio.Queue) -> None:
+        """Разбирает свою очередь исходящих запросов по одному, соблюдая лимит Telegram"""
+        while True:
+            method, kwargs, future = await send_q.get()
+            try:
+                result = await self._send_now(method, kwargs)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                send_q.task_done()
     
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Обработчик команды /start"""
@@ -267,10 +921,10 @@ class TenderBot:
         user = getattr(update, 'effective_user', None)
         user_id = getattr(user, 'id', None)
         user_name = getattr(user, 'first_name', None) or "Пользователь"
+        self._touch_session(user_id)
         # Инициализируем сессию пользователя
         if user_id and user_id not in self.user_sessions:
             self.user_sessions[user_id] = {
-                'status': 'waiting_for_tender',
                 'state': BotState.MAIN_MENU,
                 'tender_data': None,
                 'files': None,
@@ -279,6 +933,7 @@ class TenderBot:
                 'first_start': True,
                 'history': []
             }
+            self.set_status(user_id, 'waiting_for_tender')
         elif user_id:
             self.user_sessions[user_id]['state'] = BotState.MAIN_MENU
             self.user_sessions[user_id]['error_count'] = 0
@@ -286,16 +941,17 @@ class TenderBot:
         message = safe_get_message(update)
         if message:
             await message.reply_text(
-                "Привет! Я TenderBot – анализирую тендеры, проверяю компании и нахожу похожие закупки.\n\nВыберите нужный раздел или отправьте номер тендера / ИНН.",
+                start_text,
                 reply_markup=main_keyboard
             )
         else:
             chat = getattr(update, 'effective_chat', None)
             chat_id = getattr(chat, 'id', None)
             if chat_id:
-                await context.bot.send_message(
+                await self._limited_send(
+                    context.bot.send_message,
                     chat_id=chat_id,
-                    text="Привет! Я TenderBot – анализирую тендеры, проверяю компании и нахожу похожие закупки.\n\nВыберите нужный раздел или отправьте номер тендера / ИНН.",
+                    text=start_text,
                     reply_markup=main_keyboard
                 )
         logger.info(f"[bot] Пользователь {user_id} запустил бота")
@@ -305,41 +961,30 @@ class TenderBot:
         message = safe_get_message(update)
         if message:
             await message.reply_text(
-                "Я TenderBot – анализирую тендеры, проверяю компании и нахожу похожие закупки.\n\nВыберите нужный раздел или отправьте номер тендера / ИНН.",
+                help_command_text,
                 reply_markup=main_keyboard
             )
         else:
             chat = getattr(update, 'effective_chat', None)
             chat_id = getattr(chat, 'id', None)
             if chat_id:
-                await context.bot.send_message(
+                await self._limited_send(
+                    context.bot.send_message,
                     chat_id=chat_id,
-                    text="Я TenderBot – анализирую тендеры, проверяю компании и нахожу похожие закупки.\n\nВыберите нужный раздел или отправьте номер тендера / ИНН.",
+                    text=help_command_text,
                     reply_markup=main_keyboard
                 )
     
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Обработчик команды /status"""
-        status_text = f"""
-🔧 **Статус TenderBot**
-
-**Время работы:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**Версия:** 2.0.0
-**Статус:** ✅ Работает
-
-**API статус:**
-• DaMIA API: ✅ Доступен
-• OpenAI API: ✅ Доступен
-
-**Статистика:**
-• Обработано тендеров: {len(self.user_sessions)}
-• Скачано файлов: {len(list(downloader.download_dir.glob('*')))}
-
-**Система:**
-• Логирование: ✅ Активно
-• VPN для OpenAI: ✅ Настроен
-• Очистка файлов: ✅ Автоматическая
-        """
+        # Обход папки загрузок может быть долгим, поэтому выполняется в пуле потоков
+        loop = asyncio.get_event_loop()
+        files_count = await loop.run_in_executor(None, downloader.count_files)
+        status_text = status_text_template.format(
+            now=datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            sessions=len(self.user_sessions),
+            files=files_count,
+        )
         await update.message.reply_text(status_text, parse_mode='Markdown')
     
     async def cleanup_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -352,20 +997,64 @@ class TenderBot:
             await update.message.reply_text("❌ Ошибка при очистке файлов")
     
     async def handle_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Ставит сообщение в очередь его чата: внутри чата порядок сохраняется,
+        а долгая обработка (анализ, проверки) не задерживает другие чаты"""
+        chat = update.effective_chat
+        if chat is None:
+            await self._process_message(update, context)
+            return
+        queue = self._chat_queues.get(chat.id)
+        if queue is None:
+            queue = self._chat_queues[chat.id] = asyncio.Queue(maxsize=CHAT_QUEUE_MAXSIZE)
+        try:
+            queue.put_nowait((update, context))
+        except asyncio.QueueFull:
+            logger.warning(f"[bot] Очередь чата {chat.id} переполнена, сообщение отброшено")
+            # Предупреждаем один раз за переполнение, а не на каждое отброшенное сообщение
+            if chat.id not in self._chat_overflow_notified and update.effective_message:
+                self._chat_overflow_notified.add(chat.id)
+                await self._limited_send(
+                    update.effective_message.reply_text,
+                    text="⏳ Подождите, предыдущие запросы ещё обрабатываются. Отправьте это сообщение ещё раз чуть позже."
+                )
+            return
+        if chat.id not in self._chat_workers:
+            self._chat_workers[chat.id] = asyncio.create_task(self._chat_worker(chat.id))
+    
+    async def _chat_worker(self, chat_id: int) -> None:
+        """Последовательно обрабатывает сообщения одного чата и завершается, когда очередь пуста"""
+        queue = self._chat_queues[chat_id]
+        try:
+            while not queue.empty():
+                update, context = queue.get_nowait()
+                try:
+                    await self._process_message(update, context)
+                except Exception as e:
+                    logger.exception(f"[bot] Ошибка обработки сообщения в чате {chat_id}: {e}")
+                    # Обработчик работает вне диспетчера PTB: передаем ошибку его error handler'ам
+                    if self.app is not None and self.app.error_handlers:
+                        await self.app.process_error(update, e)
+        finally:
+            self._chat_workers.pop(chat_id, None)
+            self._chat_queues.pop(chat_id, None)
+            self._chat_overflow_notified.discard(chat_id)
+    
+    async def _process_message(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         message = update.message
         if not message or not getattr(message, 'from_user', None) or not getattr(message, 'text', None):
             logger.warning("[bot] handle_message: message, from_user или text отсутствует")
             return
         user_id = message.from_user.id
+        self._touch_session(user_id)
         session = self.user_sessions.setdefault(user_id, {'state': BotState.MAIN_MENU})
         text = message.text.strip()
         logger.info(f"[bot] Получено сообщение от {user_id}: {text}, state={session['state']}")
         if session['state'] == BotState.ANALYZE:
-            await analyze_handlers.analyze_tender_handler(update, context, self)
+            await analyze_tender_handler(update, context, self)
         elif session['state'] == BotState.SEARCH:
-            await history_handlers.history_handler(update, context, self)
+            await history_handler(update, context, self)
         elif session['state'] == BotState.SUPPLIER:
-            await company_handlers.check_company_handler(update, context, self)
+            await check_company_handler(update, context, self)
         else:
             await message.reply_text("Пожалуйста, выберите действие через меню.")
     
@@ -373,8 +1062,7 @@ class TenderBot:
         """Отправляет основную информацию о тендере"""
         try:
             # --- ВСТАВКА: распаковка по номеру тендера ---
-            if tender_info and len(tender_info) == 1 and isinstance(list(tender_info.values())[0], dict):
-                tender_info = list(tender_info.values())[0]
+            tender_info = _unwrap_tender(tender_info)
             # --- КОНЕЦ ВСТАВКИ ---
             
             logger.info(f"[bot] Ответ DaMIA: {tender_info}")
@@ -392,8 +1080,10 @@ class TenderBot:
             # Обновляем сессию пользователя
             if user_id in self.user_sessions:
                 self.user_sessions[user_id]['tender_data'] = tender_info
+                self.user_sessions[user_id]['tender_view'] = _tender_view(tender_info)
+                self.user_sessions[user_id]['reg_number'] = reg_number
                 self.user_sessions[user_id]['formatted_info'] = formatted_data
-                self.user_sessions[user_id]['status'] = 'ready_for_analysis'
+                self.set_status(user_id, 'ready_for_analysis')
             
             # Преобразуем словарь в строку для отображения
             formatted_info = f"""
@@ -412,74 +1102,38 @@ class TenderBot:
 📧 Email: {formatted_data.get('contact_email', 'Не указан')}
 """
             
-            # Создаем клавиатуру с кнопками
-            keyboard = [
-                [InlineKeyboardButton("📄 Подробный анализ", callback_data="analyze")],
-                [InlineKeyboardButton("📦 Позиции", callback_data="products_0")],
-                [InlineKeyboardButton("📎 Документы", callback_data="documents_0")],
-                [InlineKeyboardButton("📈 История тендеров", callback_data="history")],
-                [InlineKeyboardButton("🔍 Найти поставщиков", callback_data="find_suppliers")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+            # Клавиатура действий с тендером (общий экземпляр из keyboards.py)
+            reply_markup = tender_actions_keyboard
             
             # Разбиваем длинную информацию на части с более консервативным лимитом
             max_length = 3000  # Уменьшаем лимит для надежности
             if len(formatted_info) > max_length:
                 # Разбиваем на части
-                parts = []
-                current_part = ""
-                lines = formatted_info.split('\n')
-                
-                for line in lines:
-                    if len(current_part) + len(line) + 1 > max_length:
-                        if current_part:
-                            parts.append(current_part.strip())
-                        current_part = line
-                    else:
-                        current_part += '\n' + line if current_part else line
-                
-                if current_part:
-                    parts.append(current_part.strip())
+                parts = list(_chunk_text(formatted_info, max_length))
                 
                 # Отправляем первую часть с кнопками
-                try:
-                    await update.message.reply_text(
-                        f"📋 Информация о тендере (часть 1 из {len(parts)}):\n\n{parts[0]}",
-                        reply_markup=reply_markup
-                    )
-                except Exception as e:
-                    logger.error(f"[bot] Ошибка при отправке первой части: {e}")
-                    # Пробуем отправить без форматирования
-                    await update.message.reply_text(
-                        f"📋 Информация о тендере (часть 1 из {len(parts)}):\n\n{parts[0]}",
-                        reply_markup=reply_markup
-                    )
+                await self._limited_send(
+                    update.message.reply_text,
+                    text=f"📋 Информация о тендере (часть 1 из {len(parts)}):\n\n{parts[0]}",
+                    reply_markup=reply_markup
+                )
                 
-                # Отправляем остальные части
+                # Остальные части — строго по порядку, каждая после доставки предыдущей
                 for i, part in enumerate(parts[1:], 2):
                     try:
-                        await update.message.reply_text(
-                            f"📋 Продолжение информации (часть {i} из {len(parts)}):\n\n{part}"
+                        await self._limited_send(
+                            update.message.reply_text,
+                            text=f"📋 Продолжение информации (часть {i} из {len(parts)}):\n\n{part}"
                         )
                     except Exception as e:
                         logger.error(f"[bot] Ошибка при отправке части {i}: {e}")
-                        await update.message.reply_text(
-                            f"📋 Продолжение информации (часть {i} из {len(parts)}):\n\n{part}"
-                        )
             else:
                 # Отправляем основную информацию одним сообщением
-                try:
-                    await update.message.reply_text(
-                        f"📋 Информация о тендере\n\n{formatted_info}",
-                        reply_markup=reply_markup
-                    )
-                except Exception as e:
-                    logger.error(f"[bot] Ошибка при отправке основного сообщения: {e}")
-                    # Пробуем отправить без форматирования
-                    await update.message.reply_text(
-                        f"📋 Информация о тендере\n\n{formatted_info}",
-                        reply_markup=reply_markup
-                    )
+                await self._limited_send(
+                    update.message.reply_text,
+                    text=f"📋 Информация о тендере\n\n{formatted_info}",
+                    reply_markup=reply_markup
+                )
             
         except Exception as e:
             logger.error(f"[bot] Ошибка при отправке информации о тендере: {e}")
@@ -494,7 +1148,7 @@ class TenderBot:
     async def _analyze_documents(self, tender_data, files, update=None, chat_id=None, bot=None):
         # Проверяем кэш
         cache_key = get_cache_key(tender_data, files)
-        cached_result = get_cached_analysis(cache_key)
+        cached_result = await self._get_cached_analysis(cache_key)
         if cached_result:
             logger.info("[bot] Возвращаем кэшированный результат анализа")
             return cached_result
@@ -506,18 +1160,20 @@ class TenderBot:
                 if update and hasattr(update, 'edit_message_text'):
                     await update.edit_message_text(message)
                 elif bot and chat_id:
-                    await bot.send_message(chat_id=chat_id, text=message)
+                    await self._limited_send(bot.send_message, chat_id=chat_id, text=message)
             except Exception as e:
                 logger.warning(f"[bot] Не удалось отправить прогресс: {e}")
         
         try:
-            analysis_result = await analyzer.analyze_tender_documents(
-                tender_data, files, progress_callback=progress_callback
-            )
+            # Не больше OPENAI_MAX_CONCURRENCY анализов одновременно, остальные ждут своей очереди
+            async with self._openai_sem:
+                analysis_result = await analyzer.analyze_tender_documents(
+                    tender_data, files, progress_callback=progress_callback
+                )
             
             if analysis_result:
                 # Сохраняем в кэш
-                cache_analysis_result(cache_key, analysis_result)
+                await self._cache_analysis_result(cache_key, analysis_result)
                 
                 # Сохраняем поисковые запросы в сессии пользователя
                 if update and hasattr(update, 'from_user'):
@@ -534,45 +1190,35 @@ class TenderBot:
             logger.error(f"[bot] Ошибка при анализе документов: {e}")
             return None
     
-    async def _send_analysis_to_chat(self, bot, chat_id: int, analysis_result: dict) -> None:
+    async def _send_analysis_to_chat(self, bot, chat_id: int, analysis_result: dict, user_id: Optional[int] = None) -> None:
         if not analysis_result:
             logger.error(f"[bot] analysis_result is None! Не удалось проанализировать тендер. analysis_result: {analysis_result}")
-            await bot.send_message(chat_id=chat_id, text="❌ Не удалось проанализировать тендер. Попробуйте позже.")
+            await self._limited_send(bot.send_message, chat_id=chat_id, text="❌ Не удалось проанализировать тендер. Попробуйте позже.")
             return
         if not isinstance(analysis_result, dict):
             logger.error(f"[bot] analysis_result не dict: {analysis_result}")
-            await bot.send_message(chat_id=chat_id, text="❌ Не удалось проанализировать тендер (неверный формат данных). Попробуйте позже.")
+            await self._limited_send(bot.send_message, chat_id=chat_id, text="❌ Не удалось проанализировать тендер (неверный формат данных). Попробуйте позже.")
             return
         overall = analysis_result.get('overall_analysis', {})
         summary = overall.get('summary', 'Анализ недоступен')
         # --- Вырезаем раздел 'Поисковые запросы' из summary для пользователя ---
-        import re
-        summary_clean = re.split(r'Поисковые запросы\s*:?', summary, maxsplit=1, flags=re.IGNORECASE)[0].strip()
+        summary_clean = _SEARCH_QUERIES_RE.split(summary, maxsplit=1)[0].strip()
         # Разбиваем длинный анализ на части
-        if len(summary_clean) > 4000:
-            parts = [summary_clean[i:i+4000] for i in range(0, len(summary_clean), 4000)]
-            for i, part in enumerate(parts):
-                if i == 0:
-                    await bot.send_message(chat_id=chat_id, text=f"🤖 **Анализ тендера** (часть {i+1}/{len(parts)}):\n\n{part}", parse_mode='Markdown')
-                else:
-                    await bot.send_message(chat_id=chat_id, text=f"🤖 **Продолжение анализа** (часть {i+1}/{len(parts)}):\n\n{part}", parse_mode='Markdown')
-        else:
-            await bot.send_message(chat_id=chat_id, text=f"🤖 **Анализ тендера:**\n\n{summary_clean}", parse_mode='Markdown')
+        await _send_chunked(
+            functools.partial(self._limited_send, bot.send_message, chat_id=chat_id),
+            summary_clean, size=ANALYSIS_CHUNK_SIZE, escape=_summary_to_html, parse_mode='HTML'
+        )
         # --- Сохраняем поисковые запросы GPT для дальнейшего использования ---
         search_queries = analysis_result.get('search_queries', {})
-        for user_id, session in self.user_sessions.items():
-            if session.get('status') in ['ready_for_analysis', 'completed']:
-                session['search_queries'] = search_queries
+        # Запросы сохраняются только в сессию владельца анализа; в личном чате chat_id == user_id
+        session = self.user_sessions.get(user_id if user_id is not None else chat_id)
+        if session is not None and session.get('status') in ['ready_for_analysis', 'completed']:
+            session['search_queries'] = search_queries
         if not search_queries:
-            await bot.send_message(chat_id=chat_id, text="❌ Не удалось выделить товарные позиции из анализа. Попробуйте другой тендер или обратитесь к администратору.")
+            await self._limited_send(bot.send_message, chat_id=chat_id, text="❌ Не удалось выделить товарные позиции из анализа. Попробуйте другой тендер или обратитесь к администратору.")
             return
         # --- Показываем кнопки после анализа ---
-        keyboard = [
-            [InlineKeyboardButton("🔍 Найти поставщиков", callback_data="find_suppliers")],
-            [InlineKeyboardButton("⚠️ Проверить риски", callback_data="check_risks")],
-            [InlineKeyboardButton("📊 Показать похожие закупки", callback_data="history")]
-        ]
-        await bot.send_message(chat_id=chat_id, text="Что хотите сделать дальше?", reply_markup=InlineKeyboardMarkup(keyboard))
+        await self._limited_send(bot.send_message, chat_id=chat_id, text="Что хотите сделать дальше?", reply_markup=analysis_actions_keyboard)
     
     async def _send_analysis(self, update: Update, analysis_result: dict) -> None:
         """Отправляет результаты анализа"""
@@ -588,24 +1234,17 @@ class TenderBot:
         summary = overall.get('summary', 'Анализ недоступен')
         
         # Разбиваем длинный анализ на части
-        if len(summary) > 4000:
-            parts = [summary[i:i+4000] for i in range(0, len(summary), 4000)]
-            for i, part in enumerate(parts):
-                if i == 0:
-                    await update.message.reply_text(f"🤖 **Анализ тендера** (часть {i+1}/{len(parts)}):\n\n{part}", parse_mode='Markdown')
-                else:
-                    await update.message.reply_text(f"🤖 **Продолжение анализа** (часть {i+1}/{len(parts)}):\n\n{part}", parse_mode='Markdown')
-        else:
-            await update.message.reply_text(f"🤖 **Анализ тендера:**\n\n{summary}", parse_mode='Markdown')
+        await _send_chunked(update.message.reply_text, summary, size=ANALYSIS_CHUNK_SIZE, escape=_summary_to_html, parse_mode='HTML')
     
     async def handle_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Обработчик callback запросов"""
         query = update.callback_query
         user = getattr(query, 'from_user', None)
         user_id = getattr(user, 'id', None)
-        await query.answer()
         data = query.data
+        self._touch_session(user_id)
         session = self.user_sessions.get(user_id, {})
+        await query.answer()
         logger.info(f"[handle_callback] data={data}, user_id={user_id}, session={session}")
         # FSM: обновляем state в зависимости от действия
         if data == BACK_CB:
@@ -635,278 +1274,316 @@ class TenderBot:
         else:
             await query.edit_message_text("Неизвестная команда.")
 
-    async def _show_main_menu(self, query, context):
+    async def _on_noop_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Кнопки без действия (индикатор страницы): только снимаем «часики»"""
+        await update.callback_query.answer()
+
+    async def _on_documents_page(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Листание списка документов (callback dp_<номер страницы>)"""
+        query = update.callback_query
+        # Отвечаем на callback сразу и отдельно от правки: правка отложена на
+        # PAGINATION_DEBOUNCE, так что совмещать их в одном gather не с чем
+        await query.answer()
+        user_id = query.from_user.id
+        self._touch_session(user_id)
+        session = self.user_sessions.get(user_id, {})
+        page = query.data[len("dp_"):]
+        if not session.get('tender_data') or not page.isdigit():
+            return
+        # Серия быстрых нажатий склеивается: отрисовывается только последняя страница
+        key = (query.message.chat_id, query.message.message_id)
+        self._pending_page[key] = (
+            context.bot, session['tender_data'], session.get('tender_view'),
+            session.get('reg_number', ''), int(page)
+        )
+        if key not in self._debounce_tasks:
+            self._debounce_tasks[key] = asyncio.create_task(self._flush_documents_page(key))
+
+    async def _show_menu(self, query, context, text: str, keyboard: InlineKeyboardMarkup) -> None:
+        """Показывает статическое меню, редактируя сообщение с кнопками"""
+        message = query.message
+        # Повторное нажатие на ту же кнопку: сообщение уже такое, правка не нужна
+        if message is not None and message.text == text.strip() and message.reply_markup == keyboard:
+            return
         try:
-            await query.edit_message_text(welcome_text, reply_markup=main_keyboard)
+            await query.edit_message_text(text, reply_markup=keyboard)
+        except BadRequest as e:
+            if "message is not modified" in str(e).lower():
+                return
+            await self._limited_send(context.bot.send_message, chat_id=message.chat_id, text=text, reply_markup=keyboard)
         except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=welcome_text, reply_markup=main_keyboard)
+            await self._limited_send(context.bot.send_message, chat_id=message.chat_id, text=text, reply_markup=keyboard)
+
+    async def _show_main_menu(self, query, context):
+        await self._show_menu(query, context, welcome_text, main_keyboard)
 
     async def _show_analyze_menu(self, query, context):
-        try:
-            await query.edit_message_text(analyze_tender_text, reply_markup=analyze_keyboard)
-        except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=analyze_tender_text, reply_markup=analyze_keyboard)
+        await self._show_menu(query, context, analyze_tender_text, analyze_keyboard)
 
     async def _show_search_menu(self, query, context):
-        try:
-            await query.edit_message_text(search_tender_text, reply_markup=search_keyboard)
-        except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=search_tender_text, reply_markup=search_keyboard)
+        await self._show_menu(query, context, search_tender_text, search_keyboard)
 
     async def _show_supplier_menu(self, query, context):
-        try:
-            await query.edit_message_text(check_company_text, reply_markup=supplier_keyboard)
-        except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=check_company_text, reply_markup=supplier_keyboard)
+        await self._show_menu(query, context, check_company_text, supplier_keyboard)
 
     async def _show_analytics_menu(self, query, context):
-        try:
-            await query.edit_message_text(analytics_text, reply_markup=analytics_keyboard)
-        except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=analytics_text, reply_markup=analytics_keyboard)
+        await self._show_menu(query, context, analytics_text, analytics_keyboard)
 
     async def _show_profile_menu(self, query, context):
-        try:
-            await query.edit_message_text(profile_text, reply_markup=profile_keyboard)
-        except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=profile_text, reply_markup=profile_keyboard)
+        await self._show_menu(query, context, profile_text, profile_keyboard)
 
     async def _show_help_menu(self, query, context):
-        try:
-            await query.edit_message_text(help_text, reply_markup=help_keyboard)
-        except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=help_text, reply_markup=help_keyboard)
+        await self._show_menu(query, context, help_text, help_keyboard)
 
     async def _show_locked_menu(self, query, context):
-        try:
-            await query.edit_message_text(locked_text, reply_markup=locked_keyboard)
-        except Exception:
-            await context.bot.send_message(chat_id=query.message.chat_id, text=locked_text, reply_markup=locked_keyboard)
+        await self._show_menu(query, context, locked_text, locked_keyboard)
 
-    async def _send_products_list_to_chat(self, bot, chat_id: int, tender_data: dict, page: int = 0, message_id: int = None) -> None:
+    async def _send_products_list_to_chat(self, bot, chat_id: int, tender_data: dict, page: int = 0, message_id: int = None,
+                                          view: Optional[dict] = None) -> None:
         """Отправляет список товарных позиций с пагинацией"""
         # Если данные содержат номер тендера как ключ, извлекаем продукты из внутреннего объекта
-        if len(tender_data) == 1 and isinstance(list(tender_data.values())[0], dict):
-            tender_data = list(tender_data.values())[0]
+        tender_data = _unwrap_tender(tender_data)
         
         products = tender_data.get('Продукт', {}).get('ОбъектыЗак', [])
         
         if not products:
-            await bot.send_message(chat_id=chat_id, text="📦 Товарные позиции не найдены")
+            await self._limited_send(bot.send_message, chat_id=chat_id, text="📦 Товарные позиции не найдены")
             return
         
-        # Настройки пагинации
-        items_per_page = 5
-        total_pages = (len(products) + items_per_page - 1) // items_per_page
-        start_idx = page * items_per_page
-        end_idx = min(start_idx + items_per_page, len(products))
-        
-        # Создаем список товаров для текущей страницы
-        products_text = f"📦 **Товарные позиции** (страница {page + 1} из {total_pages}):\n\n"
-        
-        for i, product in enumerate(products[start_idx:end_idx], start_idx + 1):
-            name = product.get('Наименование', 'Без названия')
-            quantity = product.get('Количество', 0)
-            unit = product.get('ЕдИзм', '')
-            price = product.get('ЦенаЕд', 0)
-            total_cost = product.get('Стоимость', 0)
-            okpd = product.get('ОКПД', '')
-            
-            products_text += f"{i}. **{name}**\n"
-            products_text += f"   📊 Количество: {quantity} {unit}\n"
-            products_text += f"   💰 Цена за единицу: {format_price(price)} руб.\n"
-            products_text += f"   💵 Общая стоимость: {format_price(total_cost)} руб.\n"
-            if okpd:
-                products_text += f"   🏷️ ОКПД: {okpd}\n"
-            products_text += "\n"
-        
-        # Создаем кнопки навигации
-        keyboard = []
-        nav_buttons = []
-        
-        if total_pages > 1:
-            if page > 0:
-                nav_buttons.append(InlineKeyboardButton("⬅️ Назад", callback_data=f"products_page_{page-1}"))
-            
-            nav_buttons.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data="current_page"))
-            
-            if page < total_pages - 1:
-                nav_buttons.append(InlineKeyboardButton("Вперед ➡️", callback_data=f"products_page_{page+1}"))
-            
-            if nav_buttons:
-                keyboard.append(nav_buttons)
-        
-        reply_markup = InlineKeyboardMarkup(keyboard) if keyboard else None
+        products_text, reply_markup = self._products_page_view(products, page, view)
         
         # Если передан message_id, редактируем существующее сообщение
         if message_id is not None:
-            await bot.edit_message_text(
+            await self._limited_send(
+                bot.edit_message_text,
                 chat_id=chat_id,
                 message_id=message_id,
                 text=products_text,
-                parse_mode='Markdown',
+                parse_mode='HTML',
                 reply_markup=reply_markup
             )
         else:
             # Иначе отправляем новое сообщение
-            await bot.send_message(chat_id=chat_id, text=products_text, parse_mode='Markdown', reply_markup=reply_markup)
+            await self._limited_send(bot.send_message, chat_id=chat_id, text=products_text, parse_mode='HTML', reply_markup=reply_markup)
     
-    async def _send_documents_list_with_download(self, bot, chat_id: int, tender_data: dict, reg_number: str, page: int = 0) -> None:
-        """Отправляет список документов с возможностью скачивания и пагинацией"""
-        # Если данные содержат номер тендера как ключ, извлекаем документы из внутреннего объекта
-        if len(tender_data) == 1 and isinstance(list(tender_data.values())[0], dict):
-            tender_data = list(tender_data.values())[0]
-        
-        documents = tender_data.get('Документы', [])
-        
-        if not documents:
-            await bot.send_message(chat_id=chat_id, text="📄 Документы не найдены")
-            return
+    def _products_page_view(self, products: list, page: int, view: Optional[dict] = None) -> tuple:
+        """Текст и разметка страницы товаров; повторные клики по той же странице
+        берутся из self._page_cache без повторной отрисовки.
+        view — подготовленное _tender_view отображение тех же товаров"""
+        key = (id(products), page)
+        cached = self._page_cache.get(key)
+        # Сравнение по identity защищает от повторного использования id() другим списком
+        if cached is not None and cached[0] is products:
+            self._page_cache.move_to_end(key)
+            return cached[1], cached[2]
         
         # Настройки пагинации
-        items_per_page = 8
-        total_pages = (len(documents) + items_per_page - 1) // items_per_page
+        items_per_page = 5
+        total_pages = (len(products) + items_per_page - 1) // items_per_page
         start_idx = page * items_per_page
-        end_idx = min(start_idx + items_per_page, len(documents))
+        end_idx = min(start_idx + items_per_page, len(products))
+        
+        # Создаем список товаров для текущей страницы
+        parts = [PRODUCTS_HEADER_TEMPLATE.format(page=page + 1, total=total_pages)]
+        append = parts.append
+        card = PRODUCT_CARD_TEMPLATE.format
+        esc, fp = _html, format_price
+        rows = view['products'] if view and len(view['products']) == len(products) else None
+        for i, product in enumerate(islice(products, start_idx, end_idx), start_idx + 1):
+            get = product.get
+            okpd = esc(get('ОКПД', ''))
+            if rows:
+                name, price, cost = rows[i - 1]
+            else:
+                name = esc(get('Наименование', 'Без названия'))
+                price, cost = fp(get('ЦенаЕд', 0)), fp(get('Стоимость', 0))
+            append(card(
+                idx=i,
+                name=name,
+                qty=esc(get('Количество', 0)),
+                unit=esc(get('ЕдИзм', '')),
+                price=price,
+                cost=cost,
+                extras=f"   🏷️ ОКПД: {okpd}\n" if okpd else "",
+            ))
+        products_text = "".join(parts)
         
-        # Создаем список документов для текущей страницы
-        docs_text = f"📄 **Документы тендера** (страница {page + 1} из {total_pages}):\n\n"
+        # Создаем кнопки навигации
+        nav_row = _nav_row("products_page", page, total_pages)
+        reply_markup = _markup_from_spec((nav_row,)) if nav_row else None
         
-        for i, doc in enumerate(documents[start_idx:end_idx], start_idx + 1):
-            name = doc.get('Название', 'Без названия')
-            date = doc.get('ДатаРазм', '')
-            files = doc.get('Файлы', [])
-            
-            docs_text += f"{i}. **{name}**\n"
-            if date:
-                docs_text += f"   📅 Дата: {format_date(date)}\n"
-            if files:
-                docs_text += f"   📎 Файлов: {len(files)}\n"
-            docs_text += "\n"
-        
-        docs_text += "💾 **Скачать все документы:**"
-        
-        # Создаем кнопки навигации и скачивания
-        keyboard = []
-        
-        # Кнопки навигации
-        if total_pages > 1:
-            nav_buttons = []
-            if page > 0:
-                nav_buttons.append(InlineKeyboardButton("⬅️ Назад", callback_data=f"documents_page_{page-1}"))
-            
-            nav_buttons.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data="current_page"))
-            
-            if page < total_pages - 1:
-                nav_buttons.append(InlineKeyboardButton("Вперед ➡️", callback_data=f"documents_page_{page+1}"))
-            
-            if nav_buttons:
-                keyboard.append(nav_buttons)
+        if len(self._page_cache) >= DOCS_CACHE_MAXSIZE:
+            self._page_cache.popitem(last=False)
+        self._page_cache[key] = (products, products_text, reply_markup)
+        return products_text, reply_markup
+    
+    async def _build_documents_view(self, tender_data: dict, reg_number: str, page: int,
+                                    view: Optional[dict] = None) -> tuple:
+        """Формирует текст и клавиатуру страницы документов.
+        Возвращает (None, None), если документов нет."""
+        # Если данные содержат номер тендера как ключ, извлекаем документы из внутреннего объекта
+        tender_data = _unwrap_tender(tender_data)
         
-        # Кнопка скачивания
-        keyboard.append([InlineKeyboardButton("📥 Скачать документы", callback_data=f"download_{reg_number}")])
+        documents = tender_data.get('Документы', [])
         
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        if not documents:
+            return None, None
         
-        await bot.send_message(chat_id=chat_id, text=docs_text, parse_mode='Markdown', reply_markup=reply_markup)
+        if len(documents) > DOCS_OFFLOAD_THRESHOLD:
+            # Большой список разбирается в пуле потоков, чтобы не задерживать другие обновления
+            loop = asyncio.get_event_loop()
+            docs_text, keyboard_spec = await loop.run_in_executor(
+                None, self._render_documents_view, view, reg_number, documents, page
+            )
+        else:
+            docs_text, keyboard_spec = self._render_documents_view(view, reg_number, documents, page)
+        # Объекты PTB собираются в потоке event loop
+        return docs_text, _markup_from_spec(keyboard_spec)
+    
+    def _render_documents_view(self, view: Optional[dict], reg_number: str, documents: list, page: int) -> tuple:
+        """Текст и спецификация клавиатуры страницы документов (без объектов PTB)"""
+        snapshot = (view and view['docs_columns']) or self._documents_snapshot(reg_number, documents)
+        return _render_documents_page(reg_number, page, snapshot)
+    
+    def _documents_snapshot(self, reg_number: str, documents: list) -> tuple:
+        """Возвращает неизменяемый снимок документов тендера для кэша отрисовки"""
+        fingerprint = (len(documents), documents[0].get('ДатаРазм', ''))
+        cached = self._docs_cache.get(reg_number)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        snapshot = _documents_columns(documents)
+        if len(self._docs_cache) >= DOCS_CACHE_MAXSIZE:
+            self._docs_cache.pop(next(iter(self._docs_cache)))
+        self._docs_cache[reg_number] = (fingerprint, snapshot)
+        return snapshot
+    
+    async def _send_documents_list_with_download(self, bot, chat_id: int, tender_data: dict, reg_number: str, page: int = 0,
+                                                 view: Optional[dict] = None) -> None:
+        """Отправляет список документов с возможностью скачивания и пагинацией"""
+        docs_text, reply_markup = await self._build_documents_view(tender_data, reg_number, page, view)
+        if docs_text is None:
+            await self._limited_send(bot.send_message, chat_id=chat_id, text="📄 Документы не найдены")
+            return
+        await self._limited_send(bot.send_message, chat_id=chat_id, text=docs_text, parse_mode='HTML', reply_markup=reply_markup)
     
     async def _send_detailed_info_to_chat(self, bot, chat_id: int, tender_info: dict) -> None:
         """Отправляет подробную информацию о тендере"""
-        detailed_text = f"""
-🏢 **Подробная информация о тендере**
-
-🔍 **Детали закупки:**
-• **Способ закупки:** {tender_info['procurement_type']}
-• **Место поставки:** {tender_info['delivery_place']}
-• **Срок поставки:** {tender_info['delivery_terms']}
-• **Обеспечение заявки:** {tender_info['guarantee_amount']}
-• **Источник финансирования:** {tender_info['funding_source']}
-
-🌍 **Региональная информация:**
-• **Регион:** {tender_info['region']}
-• **Федеральный закон:** {tender_info['federal_law']}-ФЗ
-
-🏢 **Электронная торговая площадка:**
-• **Название:** {tender_info['etp_name']}
-• **Сайт:** {tender_info['etp_url']}
-
-📞 **Контактная информация:**
-• **Ответственное лицо:** {tender_info['contact_person']}
-• **Телефон:** {format_phone(tender_info['contact_phone'])}
-• **Email:** {tender_info['contact_email']}
-
-💳 **Финансовые детали:**
-• **ИКЗ:** {tender_info['ikz']}
-• **Аванс:** {tender_info['advance_percent']}%
-• **Обеспечение исполнения:** {tender_info['execution_amount']}
-• **Банковское сопровождение:** {tender_info['bank_support']}
-        """
+        fields = _FormatDefaults({key: _html(value) for key, value in tender_info.items()})
+        if 'contact_phone' in tender_info:
+            fields['contact_phone'] = _html(format_phone(tender_info['contact_phone']))
+        detailed_text = DETAILED_INFO_TEMPLATE.format_map(fields)
         
-        await bot.send_message(chat_id=chat_id, text=detailed_text, parse_mode='Markdown')
+        await self._limited_send(bot.send_message, chat_id=chat_id, text=detailed_text, parse_mode='HTML')
     
     def setup_handlers(self):
         """Настраивает обработчики команд и сообщений"""
-        self.app.add_handler(CommandHandler("start", self.start_command))
-        self.app.add_handler(CommandHandler("help", self.help_command))
-        self.app.add_handler(CommandHandler("cancel", self.cancel_command))
-        self.app.add_handler(CommandHandler("status", self.status_command))
-        self.app.add_handler(CommandHandler("cleanup", self.cleanup_command))
-        self.app.add_handler(CommandHandler("check", lambda update, context: company_handlers.check_company_handler(update, context, self)))
-        self.app.add_handler(CommandHandler("analyze", lambda update, context: analyze_handlers.analyze_tender_handler(update, context, self)))
-        self.app.add_handler(CommandHandler("history", lambda update, context: history_handlers.history_handler(update, context, self)))
-        self.app.add_handler(CallbackQueryHandler(self.handle_callback))
+        # Все команды разбираются одним обработчиком через словарь вместо цепочки CommandHandler
+        self._commands = {
+            "start": self.start_command,
+            "help": self.help_command,
+            "cancel": self.cancel_command,
+            "status": self.status_command,
+            "cleanup": self.cleanup_command,
+            "check": lambda update, context: check_company_handler(update, context, self),
+            "analyze": lambda update, context: analyze_tender_handler(update, context, self),
+            "history": lambda update, context: history_handler(update, context, self),
+        }
+        self.app.add_handler(MessageHandler(filters.COMMAND, self._dispatch_command))
+        # Все callback'и разбираются одним обработчиком: точное совпадение callback_data
+        # ищется в словаре, параметризованные — по короткому списку префиксов
+        self._callback_routes = {
+            "current_page": self._on_noop_callback,
+            **dict.fromkeys(TENDER_CARD_CALLBACKS, handle_tender_card_callback),
+            **{name: generic_callback_handler_factory(name) for name in STUB_CALLBACKS},
+        }
+        self._callback_prefixes = (
+            ("dp_", self._on_documents_page),
+            ("analyze_found_tender:", analyze_found_tender_callback),
+            *((prefix, generic_callback_handler_factory(name)) for name, prefix in STUB_CALLBACK_PREFIXES),
+        )
+        self.app.add_handler(CallbackQueryHandler(self._dispatch_callback))
         self.app.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
-        self.app.add_handler(CallbackQueryHandler(handle_tender_card_callback, pattern="^(download_docs|analyze_tz|check_customer|similar_history)$"))
-        self.app.add_handler(CallbackQueryHandler(analyze_found_tender_callback, pattern=r"^analyze_found_tender:"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('products_page'), pattern=r"^products_page_"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('documents_page'), pattern=r"^documents_page_"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('download'), pattern=r"^download_"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('show_tenders'), pattern=r"^show_tenders$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('export_excel'), pattern=r"^export_excel$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('subscribe_selection'), pattern=r"^subscribe_selection$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('assess_reliability'), pattern=r"^assess_reliability$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('show_contacts'), pattern=r"^show_contacts$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('show_tender_history'), pattern=r"^show_tender_history$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('show_analytics'), pattern=r"^show_analytics$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('download_analytics_excel'), pattern=r"^download_analytics_excel$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('setup_notifications'), pattern=r"^setup_notifications$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('faq'), pattern=r"^faq$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('contact_support'), pattern=r"^contact_support$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('find_suppliers'), pattern=r"^find_suppliers$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('check_risks'), pattern=r"^check_risks$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('pay_from_balance'), pattern=r"^pay_from_balance$"))
-        self.app.add_handler(CallbackQueryHandler(generic_callback_handler_factory('profile'), pattern=r"^profile$"))
+    
+    async def _dispatch_callback(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Вызывает обработчик callback'а по callback_data; меню и все прочее — handle_callback"""
+        data = update.callback_query.data or ""
+        handler = self._callback_routes.get(data)
+        if handler is None:
+            handler = next(
+                (route for prefix, route in self._callback_prefixes if data.startswith(prefix)),
+                self.handle_callback
+            )
+        await handler(update, context)
+    
+    async def _dispatch_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Вызывает обработчик команды по имени (/cmd или /cmd@bot)"""
+        text = update.effective_message.text or ""
+        if not text:
+            return
+        command, _, target = text.split(maxsplit=1)[0][1:].partition('@')
+        # Команды, адресованные другому боту в группе (/start@OtherBot), не наши
+        if target and target.lower() != (context.bot.username or "").lower():
+            return
+        handler = self._commands.get(command.lower())
+        if handler:
+            await handler(update, context)
     
     def run(self):
         try:
-            # Настройка с увеличенными таймаутами
-            builder = ApplicationBuilder().token(TELEGRAM_TOKEN)
-            
-            # Увеличиваем таймауты для предотвращения зависаний
-            # Примечание: request_timeout, connect_timeout, read_timeout не поддерживаются в ApplicationBuilder
-            # Вместо этого используем настройки в run_polling
+            # concurrent_updates: обновления разных пользователей обрабатываются параллельно
+            # (листание, меню, анализ не ждут друг друга); порядок текстовых сообщений
+            # внутри одного чата сохраняют очереди _chat_queues
+            builder = ApplicationBuilder().token(TELEGRAM_TOKEN).concurrent_updates(True)
             
             # Пробуем настроить прокси если есть проблемы с подключением
+            proxy_url = None
             try:
                 # Проверяем, есть ли переменные окружения для прокси
                 proxy_url = os.environ.get('HTTP_PROXY') or os.environ.get('HTTPS_PROXY')
                 if proxy_url:
                     logger.info(f"[bot] Используем прокси: {proxy_url}")
-                    builder.proxy_url(proxy_url)
             except Exception as proxy_error:
                 logger.warning(f"[bot] Не удалось настроить прокси: {proxy_error}")
             
-            self.app = builder.build()
+            # Общий пул соединений к Bot API; при установленном h2 все вызовы
+            # мультиплексируются поверх одного HTTP/2-соединения.
+            # Ответы разбираются через orjson, если он установлен
+            request_cls = OrjsonHTTPXRequest if ORJSON_SUPPORT else HTTPXRequest
+            builder.request(request_cls(
+                connection_pool_size=TELEGRAM_POOL_SIZE,
+                http_version="2" if HTTP2_SUPPORT else "1.1",
+                proxy_url=proxy_url,
+                connect_timeout=TELEGRAM_CONNECT_TIMEOUT,
+                read_timeout=TELEGRAM_READ_TIMEOUT,
+                write_timeout=TELEGRAM_WRITE_TIMEOUT,
+                pool_timeout=TELEGRAM_POOL_TIMEOUT
+            ))
+            # getUpdates идет по собственному соединению и не занимает общий пул
+            builder.get_updates_request(request_cls(connection_pool_size=1, proxy_url=proxy_url))
             
-            # Дополнительные настройки для HTTP клиента
-            if hasattr(self.app.bot, 'request'):
-                self.app.bot.request.timeout = 60.0
+            builder.post_init(self._post_init)
+            builder.post_shutdown(self._post_shutdown)
+            
+            self.app = builder.build()
             
             self.setup_handlers()
             logger.info("🚀 TenderBot запущен")
             print("🤖 TenderBot запущен и готов к работе!")
             print("📝 Логи сохраняются в файл:", LOG_FILE)
             
+            if WEBHOOK_HOST:
+                logger.info(f"[bot] Запуск через webhook: https://{WEBHOOK_HOST}/<token>, порт {WEBHOOK_PORT}")
+                self.app.run_webhook(
+                    listen=WEBHOOK_LISTEN,
+                    port=WEBHOOK_PORT,
+                    url_path=TELEGRAM_TOKEN,
+                    webhook_url=f"https://{WEBHOOK_HOST}/{TELEGRAM_TOKEN}",
+                    secret_token=WEBHOOK_SECRET,
+                    drop_pending_updates=True,
+                    allowed_updates=['message', 'callback_query']
+                )
+                return
+            
             # Запуск с оптимизированными настройками для уменьшения нагрузки
             self.app.run_polling(
                 timeout=120,  # Увеличиваем интервал до 2 минут
@@ -923,76 +1600,115 @@ class TenderBot:
             print(f"❌ Неожиданная ошибка: {e}")
             raise
 
+    async def _post_init(self, application) -> None:
+        """Настраивает event loop после инициализации приложения"""
+        # Один общий пул потоков на весь процесс вместо пулов, создаваемых по месту
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=EXECUTOR_MAX_WORKERS, thread_name_prefix='tenderbot')
+        )
+        self._send_qs = [asyncio.Queue(maxsize=SEND_QUEUE_MAXSIZE // SEND_WORKERS) for _ in range(SEND_WORKERS)]
+        # Кэш анализа создается при запуске, а не при импорте модуля (каталог на диске)
+        self._analysis_cache = DiskAnalysisCache() if DISKCACHE_SUPPORT else AnalysisCache()
+        # Периодическая очистка устаревших результатов анализа (JobQueue есть только
+        # при установленном python-telegram-bot[job-queue])
+        if application.job_queue is not None:
+            application.job_queue.run_repeating(
+                self._sweep_analysis_cache,
+                interval=ANALYSIS_CACHE_SWEEP_INTERVAL,
+                first=ANALYSIS_CACHE_SWEEP_INTERVAL
+            )
+        self._send_workers = [asyncio.create_task(self._send_worker(send_q)) for send_q in self._send_qs]
+
+    async def _post_shutdown(self, application) -> None:
+        """Останавливает фоновые задачи бота: обработчики очередей чатов и отправки"""
+        # Без отложенных страниц отмененная отрисовка не перезапустит сама себя
+        self._pending_page.clear()
+        tasks = [*self._chat_workers.values(), *self._send_workers, *self._debounce_tasks.values()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._chat_workers.clear()
+        self._chat_queues.clear()
+        self._send_workers = []
+        self._send_qs = []
+    
+    async def _analysis_cache_call(self, func: Callable, *args):
+        """Вызывает метод кэша анализа; дисковый кэш — в пуле потоков"""
+        if self._analysis_cache.BLOCKING:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, func, *args)
+        return func(*args)
+    
+    async def _get_cached_analysis(self, cache_key: str) -> Optional[Dict]:
+        """Получает результат анализа из кэша"""
+        if self._analysis_cache is None:
+            return None
+        result = await self._analysis_cache_call(self._analysis_cache.get, cache_key)
+        if result is not None:
+            logger.info(f"[cache] Найден кэшированный результат для {cache_key}")
+        return result
+    
+    async def _cache_analysis_result(self, cache_key: str, result: Dict) -> None:
+        """Сохраняет результат анализа в кэш"""
+        if self._analysis_cache is None:
+            return
+        await self._analysis_cache_call(self._analysis_cache.set, cache_key, result)
+        logger.info(f"[cache] Результат сохранен в кэш: {cache_key}")
+    
+    async def _sweep_analysis_cache(self, context: ContextTypes.DEFAULT_TYPE) -> None:
+        """Задача JobQueue: удаляет устаревшие записи кэша анализа"""
+        if self._analysis_cache is None:
+            return
+        removed = await self._analysis_cache_call(self._analysis_cache.cleanup_expired)
+        if removed:
+            logger.info(f"[cache] Удалено устаревших результатов анализа: {removed}")
+
     async def _generate_supplier_queries(self, formatted_info):
         # Пример: возвращаем список поисковых запросов на основе анализа
         # Можно сделать умнее, если в анализе есть ключевые слова
         subject = formatted_info.get('subject', '')
         return [subject] if subject else []
 
-    async def _update_documents_message(self, bot, chat_id: int, message_id: int, tender_data: dict, reg_number: str, page: int) -> None:
+    async def _flush_documents_page(self, key: tuple) -> None:
+        """Через PAGINATION_DEBOUNCE отрисовывает последнюю запрошенную страницу документов"""
+        try:
+            await asyncio.sleep(PAGINATION_DEBOUNCE)
+            bot, tender_data, view, reg_number, page = self._pending_page.pop(key)
+            await self._update_documents_message(bot, key[0], key[1], tender_data, reg_number, page, view)
+        except Exception as e:
+            logger.error(f"[bot] Ошибка при листании документов: {e}")
+        finally:
+            self._debounce_tasks.pop(key, None)
+            # Нажатия, пришедшие во время правки сообщения, отрисуются следующим заходом
+            if key in self._pending_page:
+                self._debounce_tasks[key] = asyncio.create_task(self._flush_documents_page(key))
+
+    async def _update_documents_message(self, bot, chat_id: int, message_id: int, tender_data: dict, reg_number: str, page: int,
+                                        view: Optional[dict] = None) -> None:
         """Обновляет сообщение с документами"""
-        # Если данные содержат номер тендера как ключ, извлекаем документы из внутреннего объекта
-        if len(tender_data) == 1 and isinstance(list(tender_data.values())[0], dict):
-            tender_data = list(tender_data.values())[0]
-        
-        documents = tender_data.get('Документы', [])
-        
-        if not documents:
-            await bot.send_message(chat_id=chat_id, text="📄 Документы не найдены")
+        docs_text, reply_markup = await self._build_documents_view(tender_data, reg_number, page, view)
+        if docs_text is None:
+            await self._limited_send(bot.send_message, chat_id=chat_id, text="📄 Документы не найдены")
             return
-        
-        # Настройки пагинации
-        items_per_page = 8
-        total_pages = (len(documents) + items_per_page - 1) // items_per_page
-        start_idx = page * items_per_page
-        end_idx = min(start_idx + items_per_page, len(documents))
-        
-        # Создаем список документов для текущей страницы
-        docs_text = f"📄 **Документы тендера** (страница {page + 1} из {total_pages}):\n\n"
-        
-        for i, doc in enumerate(documents[start_idx:end_idx], start_idx + 1):
-            name = doc.get('Название', 'Без названия')
-            date = doc.get('ДатаРазм', '')
-            files = doc.get('Файлы', [])
-            
-            docs_text += f"{i}. **{name}**\n"
-            if date:
-                docs_text += f"   📅 Дата: {format_date(date)}\n"
-            if files:
-                docs_text += f"   📎 Файлов: {len(files)}\n"
-            docs_text += "\n"
-        
-        docs_text += "💾 **Скачать все документы:**"
-        
-        # Создаем кнопки навигации и скачивания
-        keyboard = []
-        
-        # Кнопки навигации
-        if total_pages > 1:
-            nav_buttons = []
-            if page > 0:
-                nav_buttons.append(InlineKeyboardButton("⬅️ Назад", callback_data=f"documents_page_{page-1}"))
-            
-            nav_buttons.append(InlineKeyboardButton(f"{page + 1}/{total_pages}", callback_data="current_page"))
-            
-            if page < total_pages - 1:
-                nav_buttons.append(InlineKeyboardButton("Вперед ➡️", callback_data=f"documents_page_{page+1}"))
-            
-            if nav_buttons:
-                keyboard.append(nav_buttons)
-        
-        # Кнопка скачивания
-        keyboard.append([InlineKeyboardButton("📥 Скачать документы", callback_data=f"download_{reg_number}")])
-        
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await bot.edit_message_text(
+        # Клавиатура однозначно задается номером тендера и страницей (она есть в тексте),
+        # поэтому совпадение хэша означает, что Telegram ответит "message is not modified"
+        key = (chat_id, message_id)
+        content_hash = hash((docs_text, reg_number))
+        if self._last_msg.get(key) == content_hash:
+            return
+        await self._limited_send(
+            bot.edit_message_text,
             chat_id=chat_id,
             message_id=message_id,
             text=docs_text,
-            parse_mode='Markdown',
+            parse_mode='HTML',
             reply_markup=reply_markup
         )
+        # Запоминаем содержимое только после успешной правки: иначе повтор
+        # той же страницы после ошибки был бы ошибочно пропущен
+        if key not in self._last_msg and len(self._last_msg) >= DOCS_CACHE_MAXSIZE:
+            self._last_msg.pop(next(iter(self._last_msg)))
+        self._last_msg[key] = content_hash
 
     async def _show_tenders_menu(self, query, context):
         """Показывает меню госзакупок"""
@@ -1014,12 +1730,9 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 • Предоставлю структурированный отчет
         """
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 Назад", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = back_to_main_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _show_supplier_check_menu(self, query, context):
         """Показывает меню проверки контрагентов"""
@@ -1042,16 +1755,9 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 **Пример ИНН:** `7704627217`
         """
         
-        keyboard = [
-            [InlineKeyboardButton("🏛️ Проверка ФНС", callback_data="fns_check")],
-            [InlineKeyboardButton("⚖️ Арбитражные дела", callback_data="arbitr_check")],
-            [InlineKeyboardButton("📈 Скоринг", callback_data="scoring_check")],
-            [InlineKeyboardButton("👮 Проверка ФССП", callback_data="fssp_check")],
-            [InlineKeyboardButton("🔙 Главное меню", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = supplier_check_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _show_supplier_search_menu(self, query, context):
         """Показывает меню поиска поставщиков"""
@@ -1074,12 +1780,9 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 ```
         """
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 Назад", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = back_to_main_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _show_profile_menu(self, query, context):
         """Показывает личный кабинет"""
@@ -1103,31 +1806,31 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 🆓 **Дневной лимит:** {user_info['daily_limit']} запросов
 
 **Статистика использования:**
-• Проверено тендеров: {len([s for s in self.user_sessions.values() if s.get('status') == 'completed'])}
+• Проверено тендеров: {self._status_count('completed')}
 • Проверено контрагентов: {user_info['suppliers_checked']}
 • Текущий статус: {session.get('status', 'не активен')}
         """
         
         # Определяем кнопки в зависимости от статуса подписки
         if user_info['has_subscription']:
-            subscription_button = InlineKeyboardButton("🔄 Продлить подписку", callback_data="extend_subscription")
+            subscription_button = _button("🔄 Продлить подписку", "extend_subscription")
         else:
-            subscription_button = InlineKeyboardButton("💳 Купить подписку", callback_data="buy_subscription")
+            subscription_button = _button("💳 Купить подписку", "buy_subscription")
         
         keyboard = [
             [subscription_button],
-            [InlineKeyboardButton("👥 Реферальная система", callback_data="referral_system")],
-            [InlineKeyboardButton("❓ Помощь", callback_data="help")]
+            [_button("👥 Реферальная система", "referral_system")],
+            [_button("❓ Помощь", "help")]
         ]
         
         # Добавляем кнопку админ панели для пользователя hoproqr
         if query.from_user.username == "hoproqr":
-            keyboard.append([InlineKeyboardButton("⚙️ Админ панель", callback_data="admin_panel")])
+            keyboard.append([_button("⚙️ Админ панель", "admin_panel")])
         
-        keyboard.append([InlineKeyboardButton("🔙 Назад", callback_data="back_to_main")])
+        keyboard.append([_button("🔙 Назад", "back_to_main")])
         reply_markup = InlineKeyboardMarkup(keyboard)
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _handle_fns_check(self, query, context):
         """Обработчик проверки ФНС"""
@@ -1146,19 +1849,13 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 **Пример:** `7704627217`
         """
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 К проверке контрагентов", callback_data="back_to_supplier_check")],
-            [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = inn_check_back_keyboard
         
         # Устанавливаем статус ожидания ИНН для ФНС
         user_id = query.from_user.id
-        if user_id not in self.user_sessions:
-            self.user_sessions[user_id] = {}
-        self.user_sessions[user_id]['status'] = 'waiting_for_inn_fns'
+        self.set_status(user_id, 'waiting_for_inn_fns')
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _handle_arbitr_check(self, query, context):
         """Обработчик проверки арбитража"""
@@ -1177,19 +1874,13 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 **Пример:** `7704627217`
         """
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 К проверке контрагентов", callback_data="back_to_supplier_check")],
-            [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = inn_check_back_keyboard
         
         # Устанавливаем статус ожидания ИНН для арбитража
         user_id = query.from_user.id
-        if user_id not in self.user_sessions:
-            self.user_sessions[user_id] = {}
-        self.user_sessions[user_id]['status'] = 'waiting_for_inn_arbitr'
+        self.set_status(user_id, 'waiting_for_inn_arbitr')
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _handle_scoring_check(self, query, context):
         """Обработчик скоринга"""
@@ -1208,19 +1899,13 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 **Пример:** `7704627217`
         """
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 К проверке контрагентов", callback_data="back_to_supplier_check")],
-            [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = inn_check_back_keyboard
         
         # Устанавливаем статус ожидания ИНН для скоринга
         user_id = query.from_user.id
-        if user_id not in self.user_sessions:
-            self.user_sessions[user_id] = {}
-        self.user_sessions[user_id]['status'] = 'waiting_for_inn_scoring'
+        self.set_status(user_id, 'waiting_for_inn_scoring')
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _handle_fssp_check(self, query, context):
         """Обработчик проверки ФССП"""
@@ -1238,19 +1923,13 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 **Пример:** `7704627217`
         """
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 К проверке контрагентов", callback_data="back_to_supplier_check")],
-            [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = inn_check_back_keyboard
         
         # Устанавливаем статус ожидания ИНН для ФССП
         user_id = query.from_user.id
-        if user_id not in self.user_sessions:
-            self.user_sessions[user_id] = {}
-        self.user_sessions[user_id]['status'] = 'waiting_for_inn_fssp'
+        self.set_status(user_id, 'waiting_for_inn_fssp')
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _handle_inn_input(self, update, context, message_text, check_type):
         """Обработка ввода ИНН для проверки контрагентов"""
@@ -1273,57 +1952,73 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
         check_message = await update.message.reply_text(f"🔍 Проверяю ИНН {inn}...")
         
         try:
-            result = None
-            
-            if check_type == 'fns':
-                result = await self._check_fns(inn)
-            elif check_type == 'arbitr':
-                result = await self._check_arbitr(inn)
-            elif check_type == 'scoring':
-                result = await self._check_scoring(inn)
-            elif check_type == 'fssp':
-                result = await self._check_fssp(inn)
-            
-            # Удаляем промежуточное сообщение
-            await check_message.delete()
+            result = await self._run_check(check_type, inn)
             
             if result:
                 # Создаем клавиатуру с кнопками навигации
                 keyboard = [
-                    [InlineKeyboardButton("🔍 Проверить другой ИНН", callback_data=f"{check_type}_check")],
-                    [InlineKeyboardButton("🏢 К проверке контрагентов", callback_data="back_to_supplier_check")],
-                    [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")]
+                    [_button("🔍 Проверить другой ИНН", f"{check_type}_check")],
+                    [_button("🏢 К проверке контрагентов", "back_to_supplier_check")],
+                    [_button("🏠 Главное меню", "back_to_main")]
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 
-                await update.message.reply_text(result, parse_mode='Markdown', reply_markup=reply_markup)
+                # Заменяем промежуточное сообщение результатом вместо delete + send
+                await check_message.edit_text(result, parse_mode='Markdown', reply_markup=reply_markup)
             else:
-                await update.message.reply_text("❌ Ошибка при проверке. Попробуйте позже.")
+                await check_message.edit_text("❌ Ошибка при проверке. Попробуйте позже.")
                 
         except Exception as e:
-            # Удаляем промежуточное сообщение при ошибке
-            await check_message.delete()
-            
             logger.error(f"[bot] Ошибка при проверке ИНН {inn}: {e}")
             # Экранируем специальные символы для Markdown
-            error_msg = str(e).replace('*', '\\*').replace('_', '\\_').replace('`', '\\`').replace('[', '\\[').replace(']', '\\]')
+            error_msg = str(e).translate(_MD_LEGACY_TABLE)
             
             # Создаем клавиатуру с кнопками навигации
             keyboard = [
-                [InlineKeyboardButton("🔍 Попробовать снова", callback_data=f"{check_type}_check")],
-                [InlineKeyboardButton("🏢 К проверке контрагентов", callback_data="back_to_supplier_check")],
-                [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")]
+                [_button("🔍 Попробовать снова", f"{check_type}_check")],
+                [_button("🏢 К проверке контрагентов", "back_to_supplier_check")],
+                [_button("🏠 Главное меню", "back_to_main")]
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await update.message.reply_text(
+            await check_message.edit_text(
                 f"❌ Произошла ошибка при проверке: {error_msg}",
                 parse_mode='Markdown',
                 reply_markup=reply_markup
             )
         
         # Сбрасываем статус пользователя
-        self.user_sessions[user_id]['status'] = 'waiting_for_tender'
+        self.set_status(user_id, 'waiting_for_tender')
+    
+    async def _run_check(self, check_type: str, inn: str) -> Optional[str]:
+        """Выполняет проверку контрагента с кэшем по (тип, ИНН); одновременные
+        запросы одного и того же ИНН ждут общий запрос к API"""
+        check = self._checks.get(check_type)
+        if check is None:
+            return None
+        key = (check_type, inn)
+        ttl = FSSP_CHECK_CACHE_TTL if check_type == 'fssp' else CHECK_CACHE_TTL
+        cached = self._check_cache.get(key)
+        if cached and time.monotonic() - cached[0] < ttl:
+            return cached[1]
+        task = self._check_inflight.get(key)
+        if task is None:
+            task = self._check_inflight[key] = asyncio.create_task(self._load_check(key, check, inn))
+        # shield: отмена одного ожидающего не прерывает запрос для остальных
+        return await asyncio.shield(task)
+    
+    async def _load_check(self, key: tuple, check: Callable, inn: str) -> str:
+        """Запрашивает проверку и кладет успешный результат в кэш"""
+        try:
+            result = await check(inn)
+            # Тексты ошибок начинаются с ❌ и не кэшируются: следующий запрос пойдет в API
+            if result and not result.startswith("❌"):
+                if key not in self._check_cache and len(self._check_cache) >= CHECK_CACHE_MAXSIZE:
+                    self._check_cache.pop(next(iter(self._check_cache)))
+                self._check_cache[key] = (time.monotonic(), result)
+            return result
+        finally:
+            self._check_inflight.pop(key, None)
     
     async def _check_fns(self, inn: str) -> str:
         """Проверка по базам ФНС"""
@@ -1332,17 +2027,14 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
             company_data = await fns_api.get_company_info(inn)
             check_data = await fns_api.check_company(inn)
             
-            result = f"🏢 **Проверка ФНС для ИНН {inn}**\n\n"
-            
-            # Форматируем данные компании
-            company_info = fns_api.format_company_info(company_data)
-            result += company_info + "\n\n"
-            
-            # Форматируем результаты проверки
-            check_info = fns_api.format_company_check(check_data)
-            result += check_info
-            
-            return result
+            return "".join((
+                f"🏢 **Проверка ФНС для ИНН {inn}**\n\n",
+                # Данные компании
+                fns_api.format_company_info(company_data),
+                "\n\n",
+                # Результаты проверки
+                fns_api.format_company_check(check_data),
+            ))
             
         except Exception as e:
             logger.error(f"[bot] Ошибка при проверке ФНС: {e}")
@@ -1354,22 +2046,11 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
             # Получаем арбитражные дела
             cases_data = await arbitr_api.get_arbitrage_cases_by_inn(inn)
             
-            result = f"⚖️ **Проверка арбитражных дел для ИНН {inn}**\n\n"
-            
-            if cases_data.get('status') == 'found':
-                # Всегда используем форматированный вывод
-                summary = arbitr_api.format_arbitrage_summary(cases_data)
-                result += summary
-            elif cases_data.get('status') == 'not_found':
-                result += "✅ **Арбитражные дела не найдены**\n\n"
-                result += "💡 *Это означает, что компания не участвовала в арбитражных спорах, что является положительным фактором.*"
-            elif cases_data.get('status') == 'error':
-                error_msg = cases_data.get('error', 'Неизвестная ошибка')
-                result += f"❌ **Ошибка при получении данных:** {error_msg}"
-            else:
-                result += "❌ **Не удалось получить данные об арбитражных делах**"
-            
-            return result
+            format_cases = _ARBITR_HANDLERS.get(cases_data.get('status'), _arbitr_unknown)
+            return "".join((
+                f"⚖️ **Проверка арбитражных дел для ИНН {inn}**\n\n",
+                format_cases(cases_data),
+            ))
         except Exception as e:
             logger.error(f"[bot] Ошибка при проверке арбитражей: {e}")
             return f"❌ **Ошибка при проверке арбитражей:** {str(e)}"
@@ -1379,23 +2060,14 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
         try:
             # Получаем скоринг по всем моделям и фин. коэффициенты
             scoring_data = await scoring_api.get_comprehensive_scoring(inn)
-            result = f"📊 **Скоринг для ИНН {inn}**\n\n"
+            parts = [f"📊 **Скоринг для ИНН {inn}**\n\n"]
+            append = parts.append
             
             if scoring_data.get('status') == 'completed':
                 results = scoring_data.get('results', {})
                 
-                # Словарь для перевода названий моделей на русский
-                model_names = {
-                    '_bankrots2016': 'Риск банкротства (2016)',
-                    '_tech': 'Технический скоринг',
-                    '_diskf': 'Дискриминантный анализ',
-                    '_problemCredit': 'Проблемные кредиты',
-                    '_zsk': 'Защита от кредитных рисков',
-                    'financial_coefficients': 'Финансовые коэффициенты'
-                }
-                
                 # Модели скоринга
-                result += "🎯 **Результаты скоринга:**\n"
+                append("🎯 **Результаты скоринга:**\n")
                 scoring_models = []
                 for model_name, model_result in results.items():
                     if model_name == 'financial_coefficients':
@@ -1406,38 +2078,30 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
                         probability = model_result.get('probability', 0)
                         
                         # Получаем русское название модели
-                        display_name = model_names.get(model_name, model_name)
+                        display_name = SCORING_MODEL_NAMES.get(model_name, model_name)
                         safe_model_name = escape_markdown(str(display_name))
                         safe_risk_level = escape_markdown(str(risk_level))
                         
                         # Определяем эмодзи для уровня риска
-                        risk_emoji = "🟢" if risk_level == "low" else "🟡" if risk_level == "medium" else "🔴" if risk_level == "high" else "⚪"
+                        risk_emoji = _RISK_EMOJI.get(str(risk_level), "⚪")
                         
                         if isinstance(probability, (int, float)):
-                            result += f"• {risk_emoji} **{safe_model_name}:** {score} ({safe_risk_level}, {probability:.1f}%)\n"
+                            append(f"• {risk_emoji} **{safe_model_name}:** {score} ({safe_risk_level}, {probability:.1f}%)\n")
                         else:
-                            result += f"• {risk_emoji} **{safe_model_name}:** {score} ({safe_risk_level}, {probability})\n"
+                            append(f"• {risk_emoji} **{safe_model_name}:** {score} ({safe_risk_level}, {probability})\n")
                     else:
                         # Получаем русское название модели
-                        display_name = model_names.get(model_name, model_name)
+                        display_name = SCORING_MODEL_NAMES.get(model_name, model_name)
                         safe_model_name = escape_markdown(str(display_name))
-                        result += f"• ⚪ **{safe_model_name}:** Ошибка\n"
+                        append(f"• ⚪ **{safe_model_name}:** Ошибка\n")
                 
                 # Финансовые коэффициенты
                 fin_data = results.get('financial_coefficients', {})
                 if fin_data.get('status') == 'found':
-                    result += "\n💰 **Ключевые финансовые показатели:**\n"
+                    append("\n💰 **Ключевые финансовые показатели:**\n")
                     coefs = fin_data.get('coefficients', {})
                     
-                    # Определяем ключевые коэффициенты с их названиями и типами
-                    key_coefs = {
-                        'КоэфТекЛикв': {'name': 'Текущая ликвидность', 'type': 'ratio', 'unit': ''},
-                        'РентАктивов': {'name': 'Рентабельность активов', 'type': 'percent', 'unit': '%'},
-                        'КоэфФинАвт': {'name': 'Финансовая автономия', 'type': 'ratio', 'unit': ''},
-                        'РентПродаж': {'name': 'Рентабельность продаж', 'type': 'percent', 'unit': '%'}
-                    }
-                    
-                    for coef_code, coef_info in key_coefs.items():
+                    for coef_code, coef_info in SCORING_KEY_COEFS.items():
                         value = coefs.get(coef_code)
                         if value is not None:
                             safe_coef_name = escape_markdown(str(coef_info['name']))
@@ -1476,21 +2140,22 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
                                             norm_range_str = "нет данных"
                                         
                                         # Определяем эмодзи для сравнения с нормой
-                                        comparison_emoji = "✅" if "выше нормы" in norm_comparison.lower() else "⚠️" if "ниже нормы" in norm_comparison.lower() else "🟢" if "в пределах нормы" in norm_comparison.lower() else "⚪"
+                                        norm_match = _NORM_RE.search(str(norm_comparison))
+                                        comparison_emoji = _NORM_EMOJI.get(norm_match.group(1).lower(), "⚪") if norm_match else "⚪"
                                         
-                                        result += f"• {comparison_emoji} **{safe_coef_name} ({latest_year}):** {display_value_str}\n"
-                                        result += f"  └ Норма: {norm_value_str} (диапазон: {norm_range_str})\n"
-                                        result += f"  └ Оценка: {norm_comparison}\n"
+                                        append(f"• {comparison_emoji} **{safe_coef_name} ({latest_year}):** {display_value_str}\n")
+                                        append(f"  └ Норма: {norm_value_str} (диапазон: {norm_range_str})\n")
+                                        append(f"  └ Оценка: {norm_comparison}\n")
                             elif isinstance(value, (int, float)):
-                                result += f"• ⚪ **{safe_coef_name}:** {value:.3f}{coef_info['unit']}\n"
+                                append(f"• ⚪ **{safe_coef_name}:** {value:.3f}{coef_info['unit']}\n")
                             else:
-                                result += f"• ⚪ **{safe_coef_name}:** {value}\n"
+                                append(f"• ⚪ **{safe_coef_name}:** {value}\n")
                 else:
-                    result += "\n❌ **Финансовые показатели недоступны**\n"
+                    append("\n❌ **Финансовые показатели недоступны**\n")
             else:
-                result += "❌ **Не удалось получить скоринг или финансовые показатели.**\n"
+                append("❌ **Не удалось получить скоринг или финансовые показатели.**\n")
             
-            return result
+            return "".join(parts)
         except Exception as e:
             logger.error(f"[bot] Ошибка при проверке скоринга: {e}")
             return f"❌ **Ошибка при проверке скоринга:** {str(e)}"
@@ -1512,7 +2177,8 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
             ):
                 return f"👮 **Проверка ФССП для ИНН {inn}**\n\n✅ **Компания не найдена в базе ФССП или у нее нет исполнительных производств.**\n\n💡 *Это означает, что у компании нет задолженностей по исполнительным производствам, что является положительным фактором.*"
             
-            result = f"👮 **Проверка ФССП для ИНН {inn}**\n\n"
+            parts = [f"👮 **Проверка ФССП для ИНН {inn}**\n\n"]
+            append = parts.append
             
             if fssp_data and fssp_data.get('status') == 'success':
                 company_info = fssp_data.get('company_info', {})
@@ -1529,57 +2195,62 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
                     # Проверяем, есть ли примечание о недоступности данных
                     note = company_info.get('note')
                     if note:
-                        result += f"ℹ️ **{note}**\n\n"
+                        append(f"ℹ️ **{note}**\n\n")
                     else:
-                        result += f"🏢 **Компания:** {safe_name}\n"
-                        result += f"**ИНН:** {safe_inn}\n"
-                        result += f"**ОГРН:** {safe_ogrn}\n"
-                        result += f"**Адрес:** {safe_address}\n\n"
+                        append(f"🏢 **Компания:** {safe_name}\n")
+                        append(f"**ИНН:** {safe_inn}\n")
+                        append(f"**ОГРН:** {safe_ogrn}\n")
+                        append(f"**Адрес:** {safe_address}\n\n")
                 
                 # Сводка по производствам
                 total_proceedings = summary.get('total_proceedings', 0)
                 active_proceedings = summary.get('active_proceedings', 0)
                 total_debt = summary.get('total_debt', 0)
                 
-                result += f"📋 **Исполнительные производства:**\n"
-                result += f"• Всего: {total_proceedings}\n"
-                result += f"• Активных: {active_proceedings}\n"
-                # Проверяем, что total_debt - это число
-                if isinstance(total_debt, (int, float)):
-                    result += f"• Общая задолженность: {total_debt:,.2f} руб.\n\n"
-                else:
-                    result += f"• Общая задолженность: {total_debt} руб.\n\n"
+                append(f"📋 **Исполнительные производства:**\n")
+                append(f"• Всего: {total_proceedings}\n")
+                append(f"• Активных: {active_proceedings}\n")
+                append(f"• Общая задолженность: {_money(total_debt)} руб.\n\n")
                 
                 if proceedings:
-                    result += "📄 **Последние производства:**\n"
+                    append("📄 **Последние производства:**\n")
+                    money = _money
                     for i, proc in enumerate(proceedings[:5], 1):
-                        number = proc.get('number', 'Не указано')
-                        amount = proc.get('amount', 0)
-                        status = proc.get('status', 'Не указано')
-                        # Проверяем, что amount - это число
-                        if isinstance(amount, (int, float)):
-                            result += f"{i}. {number} - {amount:,.2f} руб. ({status})\n"
-                        else:
-                            result += f"{i}. {number} - {amount} руб. ({status})\n"
+                        get = proc.get
+                        append(f"{i}. {get('number', 'Не указано')} - {money(get('amount', 0))} руб. ({get('status', 'Не указано')})\n")
                 else:
-                    result += "✅ **Исполнительные производства не найдены**\n"
+                    append("✅ **Исполнительные производства не найдены**\n")
             else:
                 error_msg = fssp_data.get('error', 'Неизвестная ошибка') if fssp_data else 'Данные недоступны'
-                result += f"❌ **Данные ФССП недоступны: {error_msg}**\n"
+                append(f"❌ **Данные ФССП недоступны: {error_msg}**\n")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
             logger.error(f"[bot] Ошибка при проверке ФССП: {e}")
             return f"❌ Ошибка при проверке ФССП: {str(e)}"
 
     async def _get_user_info(self, user_id: int) -> dict:
-        """Получает информацию о пользователе"""
+        """Получает информацию о пользователе; при переходах по личному кабинету
+        повторные запросы в течение USER_INFO_TTL берутся из кэша.
+        Возвращается копия, чтобы вызывающий код не мог испортить кэш"""
+        now = time.monotonic()
+        cached = self._user_info_cache.get(user_id)
+        if cached and now - cached[0] < USER_INFO_TTL:
+            return dict(cached[1])
+        user_info = await self._load_user_info(user_id)
+        if user_id not in self._user_info_cache and len(self._user_info_cache) >= SESSION_MAXSIZE:
+            self._user_info_cache.pop(next(iter(self._user_info_cache)))
+        self._user_info_cache[user_id] = (now, user_info)
+        return dict(user_info)
+    
+    async def _load_user_info(self, user_id: int) -> dict:
+        """Загружает информацию о пользователе"""
         # В реальном проекте здесь была бы база данных
         # Пока используем заглушку с базовой логикой
         
         # Получаем статистику из сессий
-        completed_tenders = len([s for s in self.user_sessions.values() if s.get('status') == 'completed'])
+        completed_tenders = self._status_count('completed')
         
         # Заглушка для демонстрации
         user_info = {
@@ -1610,76 +2281,22 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
     
     async def _show_buy_subscription(self, query, context):
         """Показывает страницу покупки подписки"""
-        message = """
-💳 **Покупка подписки**
-
-**Доступные тарифы:**
-
-🥉 **Базовый** - 999 руб/месяц
-• 100 запросов в день
-• Проверка контрагентов
-• Анализ тендеров
-• Базовая поддержка
-
-🥈 **Стандарт** - 1999 руб/месяц
-• 300 запросов в день
-• Все функции базового
-• Приоритетная поддержка
-• Экспорт отчетов
-
-🥇 **Премиум** - 3999 руб/месяц
-• Безлимитные запросы
-• Все функции стандарта
-• Персональный менеджер
-• API доступ
-• Белый лейбл
-
-**Для покупки свяжитесь с менеджером:**
-📧 support@tenderbot.ru
-📱 +7 (999) 123-45-67
-        """
+        message = buy_subscription_text
         
-        keyboard = [
-            [InlineKeyboardButton("📧 Написать в поддержку", callback_data="contact_support")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="profile")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = buy_subscription_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _show_extend_subscription(self, query, context):
         """Показывает страницу продления подписки"""
         user_id = query.from_user.id
         user_info = await self._get_user_info(user_id)
         
-        message = f"""
-🔄 **Продление подписки**
-
-**Текущая подписка:**
-📅 Истекает: {user_info['subscription_expires']}
-💰 Баланс: {user_info['balance']} руб.
-
-**Варианты продления:**
-
-🥉 **Базовый** - 999 руб/месяц
-🥈 **Стандарт** - 1999 руб/месяц  
-🥇 **Премиум** - 3999 руб/месяц
-
-**Для продления:**
-📧 support@tenderbot.ru
-📱 +7 (999) 123-45-67
-
-**Или используйте баланс аккаунта**
-        """
+        message = extend_subscription_text_template.format_map(user_info)
         
-        keyboard = [
-            [InlineKeyboardButton("💳 Оплатить с баланса", callback_data="pay_from_balance")],
-            [InlineKeyboardButton("📧 Написать в поддержку", callback_data="contact_support")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="profile")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = extend_subscription_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
     
     async def _show_referral_system(self, query, context):
         """Показывает реферальную систему"""
@@ -1689,69 +2306,30 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
         # Генерируем реферальную ссылку
         ref_link = f"https://t.me/TenderBot?start=ref{user_id}"
         
-        message = f"""
-👥 **Реферальная система**
-
-**Ваша реферальная ссылка:**
-`{ref_link}`
-
-**Как это работает:**
-• Пригласите друзей по ссылке
-• За каждого приглашенного получаете 100 руб.
-• Приглашенный получает 50 руб. на баланс
-• Реферальные средства можно тратить на подписку
-
-**Ваша статистика:**
-💳 Реферальный баланс: {user_info['ref_balance']} руб.
-👥 Приглашено пользователей: {user_info['ref_balance'] // 100}
-🎁 Заработано всего: {user_info['ref_balance']} руб.
-
-**Условия:**
-• Реферал должен зарегистрироваться по вашей ссылке
-• Реферал должен совершить первую покупку
-• Бонусы начисляются в течение 24 часов
-        """
+        ref_balance = user_info['ref_balance']
+        ref_count = ref_balance // 100
         
-        keyboard = [
-            [InlineKeyboardButton("📤 Поделиться ссылкой", callback_data="share_ref_link")],
-            [InlineKeyboardButton("📊 Статистика рефералов", callback_data="ref_statistics")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="profile")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        message = referral_text_template.format_map({"ref_link": ref_link, "ref_balance": ref_balance, "ref_count": ref_count})
+        
+        reply_markup = referral_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_contact_support(self, query, context):
         """Показывает страницу контакта с поддержкой"""
-        message = """
-📧 **Контакты поддержки**
-
-Если у вас возникли вопросы или проблемы, пожалуйста, свяжитесь с нами:
-📧 support@tenderbot.ru
-📱 +7 (999) 123-45-67
-        """
+        message = contact_support_text
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 Назад", callback_data="profile")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = back_to_profile_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_pay_from_balance(self, query, context):
         """Показывает страницу оплаты с баланса"""
-        message = """
-💳 **Оплата с баланса**
-
-Вы можете оплатить подписку с вашего баланса. Пожалуйста, введите сумму для оплаты:
-        """
+        message = pay_from_balance_text
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 Назад", callback_data="extend_subscription")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = back_to_extend_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _share_ref_link(self, query, context):
         """Показывает страницу деления ссылки"""
@@ -1759,90 +2337,44 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
         user_info = await self._get_user_info(user_id)
         ref_link = f"https://t.me/TenderBot?start=ref{user_id}"
         
-        message = f"""
-📤 **Поделиться ссылкой**
-
-Вы можете поделиться своей реферальной ссылкой с друзьями:
-`{ref_link}`
-
-**Как это работает:**
-• Пригласите друзей по ссылке
-• За каждого приглашенного получаете 100 руб.
-• Приглашенный получает 50 руб. на баланс
-• Реферальные средства можно тратить на подписку
-
-**Ваша статистика:**
-💳 Реферальный баланс: {user_info['ref_balance']} руб.
-👥 Приглашено пользователей: {user_info['ref_balance'] // 100}
-🎁 Заработано всего: {user_info['ref_balance']} руб.
-
-**Условия:**
-• Реферал должен зарегистрироваться по вашей ссылке
-• Реферал должен совершить первую покупку
-• Бонусы начисляются в течение 24 часов
-        """
+        ref_balance = user_info['ref_balance']
+        ref_count = ref_balance // 100
         
-        keyboard = [
-            [InlineKeyboardButton("📤 Поделиться ссылкой", callback_data="share_ref_link")],
-            [InlineKeyboardButton("📊 Статистика рефералов", callback_data="ref_statistics")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="profile")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        message = share_ref_link_text_template.format_map({"ref_link": ref_link, "ref_balance": ref_balance, "ref_count": ref_count})
+        
+        reply_markup = referral_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_ref_statistics(self, query, context):
         """Показывает статистику рефералов"""
         user_id = query.from_user.id
         user_info = await self._get_user_info(user_id)
-        ref_count = user_info['ref_balance'] // 100
+        ref_balance = user_info['ref_balance']
+        ref_count = ref_balance // 100
         
-        message = f"""
-📊 **Статистика рефералов**
-
-👥 Приглашено пользователей: {ref_count}
-🎁 Заработано всего: {user_info['ref_balance']} руб.
-
-**Условия:**
-• Реферал должен зарегистрироваться по вашей ссылке
-• Реферал должен совершить первую покупку
-• Бонусы начисляются в течение 24 часов
-        """
+        message = ref_statistics_text_template.format_map({"ref_balance": ref_balance, "ref_count": ref_count})
         
-        keyboard = [
-            [InlineKeyboardButton("🔙 Назад", callback_data="profile")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = back_to_profile_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_admin_panel(self, query, context):
         """Показывает панель администратора"""
-        message = """
-👨‍💼 **Панель администратора**
-
-Выберите нужный раздел:
-        """
+        message = admin_panel_text
         
-        keyboard = [
-            [InlineKeyboardButton("👥 Пользователи", callback_data="admin_users")],
-            [InlineKeyboardButton("📊 Статистика", callback_data="admin_statistics")],
-            [InlineKeyboardButton("⚙️ Настройки", callback_data="admin_settings")],
-            [InlineKeyboardButton("📋 Логи", callback_data="admin_logs")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="profile")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = admin_panel_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_admin_users(self, query, context):
         """Показывает список пользователей"""
         # Получаем статистику пользователей
         total_users = len(self.user_sessions)
-        active_users = len([s for s in self.user_sessions.values() if s.get('status') != 'waiting_for_tender'])
-        completed_analyses = len([s for s in self.user_sessions.values() if s.get('status') == 'completed'])
+        active_users = total_users - self._status_count('waiting_for_tender')
+        completed_analyses = self._status_count('completed')
         
-        message = f"""
+        parts = [f"""
 👥 **Управление пользователями**
 
 📊 **Общая статистика:**
@@ -1851,7 +2383,7 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 • Завершенных анализов: {completed_analyses}
 
 **Последние активные пользователи:**
-        """
+        """]
         
         # Показываем последние 5 активных пользователей
         recent_users = []
@@ -1860,29 +2392,27 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
                 recent_users.append(f"• ID: {user_id} - {session.get('status', 'неизвестно')}")
         
         if recent_users:
-            message += "\n".join(recent_users)
+            parts.append("\n".join(recent_users))
         else:
-            message += "\n• Нет активных пользователей"
+            parts.append("\n• Нет активных пользователей")
+        message = "".join(parts)
         
-        keyboard = [
-            [InlineKeyboardButton("📊 Подробная статистика", callback_data="admin_users_detailed")],
-            [InlineKeyboardButton("🔍 Поиск пользователя", callback_data="admin_search_user")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = admin_users_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_admin_statistics(self, query, context):
         """Показывает статистику пользователей"""
-        # Подсчитываем статистику
+        # Подсчитываем статистику по индексу статусов, без обхода сессий
         total_users = len(self.user_sessions)
-        completed_analyses = len([s for s in self.user_sessions.values() if s.get('status') == 'completed'])
-        ready_analyses = len([s for s in self.user_sessions.values() if s.get('status') == 'ready_for_analysis'])
-        tender_found = len([s for s in self.user_sessions.values() if s.get('status') == 'tender_found'])
+        completed_analyses = self._status_count('completed')
+        ready_analyses = self._status_count('ready_for_analysis')
+        tender_found = self._status_count('tender_found')
+        waiting_users = self._status_count('waiting_for_tender')
+        active_sessions = total_users - waiting_users
         
         # Подсчитываем общую статистику запросов
-        total_requests = sum(len([s for s in self.user_sessions.values() if s.get('status') == 'completed']) * 3, 0)
+        total_requests = completed_analyses * 3
         
         message = f"""
 📊 **Статистика системы**
@@ -1898,60 +2428,26 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
 • Среднее на пользователя: {total_requests // max(total_users, 1)}
 
 📈 **Активность:**
-• Активных сессий: {len([s for s in self.user_sessions.values() if s.get('status') != 'waiting_for_tender'])}
-• Ожидающих ввода: {len([s for s in self.user_sessions.values() if s.get('status') == 'waiting_for_tender'])}
+• Активных сессий: {active_sessions}
+• Ожидающих ввода: {waiting_users}
 
 **Периоды:**
-• Сегодня: {len([s for s in self.user_sessions.values() if s.get('status') == 'completed'])} анализов
+• Сегодня: {completed_analyses} анализов
 • За неделю: {completed_analyses} анализов
 • За месяц: {completed_analyses} анализов
         """
         
-        keyboard = [
-            [InlineKeyboardButton("📅 По дням", callback_data="admin_stats_daily")],
-            [InlineKeyboardButton("📊 По функциям", callback_data="admin_stats_functions")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = admin_statistics_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_admin_settings(self, query, context):
         """Показывает настройки"""
-        message = """
-⚙️ **Настройки системы**
-
-**Текущие параметры:**
-• Дневной лимит запросов: 100
-• Максимальный размер файла: 50MB
-• Время жизни кэша: 1 час
-• Максимальные попытки API: 3
-
-**API статус:**
-• DaMIA API: ✅ Активен
-• OpenAI API: ✅ Активен
-• SerpAPI: ✅ Активен
-• FNS API: ✅ Активен
-• Arbitr API: ✅ Активен
-• Scoring API: ✅ Активен
-• FSSP API: ✅ Активен
-
-**Системные параметры:**
-• Логирование: ✅ Включено
-• VPN для OpenAI: ✅ Настроен
-• Автоочистка файлов: ✅ Включена
-        """
+        message = admin_settings_text
         
-        keyboard = [
-            [InlineKeyboardButton("🔧 Изменить лимиты", callback_data="admin_change_limits")],
-            [InlineKeyboardButton("🔄 Перезапустить API", callback_data="admin_restart_api")],
-            [InlineKeyboardButton("🧹 Очистить кэш", callback_data="admin_clear_cache")],
-            [InlineKeyboardButton("📋 Системные логи", callback_data="admin_system_logs")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = admin_settings_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_admin_logs(self, query, context):
         """Показывает логи"""
@@ -1961,44 +2457,40 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
         
         try:
             if os.path.exists(log_file):
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    recent_logs = lines[-10:]  # Последние 10 строк
+                # Чтение файла — в пуле потоков, чтобы не блокировать цикл событий
+                loop = asyncio.get_running_loop()
+                recent_logs = await loop.run_in_executor(None, _tail_lines, log_file, 10)  # Последние 10 строк
         except Exception as e:
             recent_logs = [f"Ошибка чтения логов: {e}"]
         
-        message = """
+        parts = ["""
 📋 **Системные логи**
 
 **Последние записи:**
-        """
+        """]
+        append = parts.append
         
         if recent_logs:
             for log in recent_logs[-5:]:  # Показываем последние 5
                 # Очищаем длинные строки
                 clean_log = log.strip()[:100] + "..." if len(log) > 100 else log.strip()
-                message += f"\n• {clean_log}"
+                append(f"\n• {clean_log}")
         else:
-            message += "\n• Логи не найдены"
+            append("\n• Логи не найдены")
         
-        message += """
+        append("""
 
 **Типы логов:**
 • INFO - Информационные сообщения
 • WARNING - Предупреждения
 • ERROR - Ошибки
 • DEBUG - Отладочная информация
-        """
+        """)
+        message = "".join(parts)
         
-        keyboard = [
-            [InlineKeyboardButton("📄 Полные логи", callback_data="admin_full_logs")],
-            [InlineKeyboardButton("🔍 Поиск по логам", callback_data="admin_search_logs")],
-            [InlineKeyboardButton("🧹 Очистить логи", callback_data="admin_clear_logs")],
-            [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
+        reply_markup = admin_logs_keyboard
         
-        await query.edit_message_text(message, parse_mode='Markdown', reply_markup=reply_markup)
+        await self._edit_markdown(query, message, reply_markup)
 
     async def _show_admin_users_detailed(self, query, context):
         # Добавьте реализацию для подробной статистики пользователей
@@ -2057,10 +2549,10 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
             return
         await query.edit_message_text("🔍 Формируем профиль компании...")
         try:
-            import asyncio
+            from company_profile import build_company_profile
             loop = asyncio.get_event_loop()
             profile_text = await loop.run_in_executor(None, build_company_profile, inn)
-            await context.bot.send_message(chat_id=query.message.chat_id, text=profile_text, parse_mode='HTML')
+            await self._limited_send(context.bot.send_message, chat_id=query.message.chat_id, text=profile_text, parse_mode='HTML')
         except Exception as e:
             logger.error(f"[bot] Ошибка при формировании профиля компании: {e}")
             await query.edit_message_text(f"❌ Ошибка при формировании профиля компании: {str(e)}")
@@ -2092,14 +2584,29 @@ https://zakupki.gov.ru/epz/order/notice/ea44/view/common-info.html?regNumber=012
         user_id = getattr(user, 'id', None)
         if user_id in self.user_sessions:
             self.user_sessions[user_id]['state'] = BotState.MAIN_MENU
-            self.user_sessions[user_id]['status'] = 'waiting_for_tender'
+            self.set_status(user_id, 'waiting_for_tender')
         message = safe_get_message(update)
         if message:
             await message.reply_text(
-                "Привет! Я TenderBot – анализирую тендеры, проверяю компании и нахожу похожие закупки.\n\nВыберите нужный раздел или отправьте номер тендера / ИНН.",
+                start_text,
                 reply_markup=main_keyboard
             )
 
+# Callback'и функций в разработке: callback_data совпадает с именем для сообщения
+STUB_CALLBACKS = (
+    'show_tenders', 'export_excel', 'subscribe_selection', 'assess_reliability',
+    'show_contacts', 'show_tender_history', 'show_analytics', 'setup_notifications',
+    'faq', 'contact_support', 'find_suppliers', 'check_risks', 'pay_from_balance',
+    'profile', 'download_analytics_excel',
+)
+# Заглушки для callback_data с параметром: (имя для сообщения, префикс)
+STUB_CALLBACK_PREFIXES = (
+    ('products_page', 'products_page_'),
+    ('download', 'dl_'),
+)
+# Кнопки карточки тендера из поиска (handlers/analyze_handlers.py)
+TENDER_CARD_CALLBACKS = ('download_docs', 'analyze_tz', 'check_customer', 'similar_history')
+
 def generic_callback_handler_factory(pattern_name):
     async def handler(update, context):
         logger = logging.getLogger(__name__)
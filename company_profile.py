@@ -1,25 +1,55 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from exportbase_api import get_company_by_inn, format_company_info
 from tenderguru_api import get_tender_history_by_inn, format_tender_history
 from fssp_api import get_fssp_by_inn, format_fssp_info
 from arbitr_api import get_arbitr_by_inn, format_arbitr_info
 
+logger = logging.getLogger(__name__)
+
+# Источники профиля в порядке вывода: (название, загрузка по ИНН, форматирование)
+PROFILE_SOURCES = (
+    ('ExportBase', get_company_by_inn, format_company_info),
+    ('TenderGuru', get_tender_history_by_inn, format_tender_history),
+    ('ФССП', get_fssp_by_inn, lambda fssp: format_fssp_info(fssp or {})),
+    ('Арбитраж', get_arbitr_by_inn, format_arbitr_info),
+)
+
+# Сколько профилей собирается одновременно без очереди (как размер общего пула бота)
+PROFILE_MAX_CONCURRENCY = 8
+# Сколько ждать источники, секунды: не успевший источник считается недоступным
+PROFILE_SOURCE_TIMEOUT = 20
+
+# Общий пул для запросов к источникам: по потоку на каждый источник каждого
+# одновременного профиля, но не новый пул на каждый вызов
+_PROFILE_POOL = ThreadPoolExecutor(
+    max_workers=PROFILE_MAX_CONCURRENCY * len(PROFILE_SOURCES),
+    thread_name_prefix='company_profile'
+)
+
 
 def build_company_profile(inn: str) -> str:
     """
     Агрегирует профиль компании по ИНН: ExportBase, TenderGuru, ФССП, Арбитраж
     Возвращает готовый текст для Telegram.
     """
+    # Запросы к источникам независимы и упираются в сеть, поэтому идут параллельно:
+    # время ответа — самый медленный источник, а не сумма всех
+    futures = [_PROFILE_POOL.submit(fetch, inn) for _, fetch, _ in PROFILE_SOURCES]
+    deadline = time.monotonic() + PROFILE_SOURCE_TIMEOUT
     blocks = []
-    # 1. Основная информация ExportBase
-    info = get_company_by_inn(inn)
-    blocks.append(format_company_info(info))
-    # 2. История тендеров TenderGuru
-    tenders = get_tender_history_by_inn(inn)
-    blocks.append(format_tender_history(tenders))
-    # 3. ФССП
-    fssp = get_fssp_by_inn(inn)
-    blocks.append(format_fssp_info(fssp or {}))
-    # 4. Арбитраж
-    arbitr = get_arbitr_by_inn(inn)
-    blocks.append(format_arbitr_info(arbitr))
-    return '\n\n'.join(blocks) 
\ No newline at end of file
+    for (name, _, format_block), future in zip(PROFILE_SOURCES, futures):
+        try:
+            result = future.result(timeout=max(deadline - time.monotonic(), 0))
+            blocks.append(format_block(result))
+        except FutureTimeoutError:
+            # Зависший источник не задерживает профиль дольше общего таймаута
+            future.cancel()
+            logger.error(f"[company_profile] Источник {name} не ответил за {PROFILE_SOURCE_TIMEOUT} с для ИНН {inn}")
+            blocks.append(f"❌ {name}: данные недоступны")
+        except Exception as e:
+            # Сбой одного источника не должен ломать весь профиль
+            logger.error(f"[company_profile] Ошибка источника {name} для ИНН {inn}: {e}")
+            blocks.append(f"❌ {name}: данные недоступны")
+    return '\n\n'.join(blocks)
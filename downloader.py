@@ -1,4 +1,5 @@
 import os
+import asyncio
 import aiofiles
 import aiohttp
 import logging
@@ -24,8 +25,10 @@ class DocumentDownloader:
         Асинхронно скачивает документы тендера с прогресс-баром
         """
         # Если tender_data — это словарь с одним ключом (номером тендера), работаем с его содержимым
-        if len(tender_data) == 1 and isinstance(list(tender_data.values())[0], dict):
-            tender_data = list(tender_data.values())[0]
+        if tender_data and len(tender_data) == 1:
+            inner = next(iter(tender_data.values()))
+            if isinstance(inner, dict):
+                tender_data = inner
 
         documents = tender_data.get("Документы", [])
         all_files = []
@@ -41,6 +44,7 @@ class DocumentDownloader:
         logger.info(f"[downloader] 📥 Начинаем скачивание {len(all_files)} документов")
 
         downloaded_files = []
+        loop = asyncio.get_event_loop()
         success_count = 0
         failed_count = 0
         
@@ -55,12 +59,14 @@ class DocumentDownloader:
                     if result:
                         downloaded_files.append(result)
                         # Если это архив, распаковываем
+                        # Распаковка синхронная, поэтому выносим её в пул потоков,
+                        # чтобы не блокировать event loop на больших архивах
                         ext = Path(result['saved_name']).suffix.lower()
                         if ext == '.zip':
-                            extracted = self._extract_zip(result['path'])
+                            extracted = await loop.run_in_executor(None, self._extract_zip, result['path'])
                             downloaded_files.extend(extracted)
                         elif ext == '.rar' and RAR_SUPPORT:
-                            extracted = self._extract_rar(result['path'])
+                            extracted = await loop.run_in_executor(None, self._extract_rar, result['path'])
                             downloaded_files.extend(extracted)
                         success_count += 1
                     else:
@@ -164,15 +170,20 @@ class DocumentDownloader:
             logger.error(f"[downloader] ❌ Ошибка при скачивании {name}: {e}")
         return None
     
-    async def _download_with_progress(self, response, filename: str, chunk_size: int = 8192) -> bytes:
-        """Скачивает файл с отображением прогресса для больших файлов"""
-        content = b''
+    async def _download_with_progress(self, response, filename: str, chunk_size: int = 8192) -> bytearray:
+        """Скачивает файл с отображением прогресса для больших файлов.
+        Прекращает чтение, как только размер превысил MAX_FILE_SIZE.
+        Возвращает собранный буфер без лишнего копирования в bytes."""
+        content = bytearray()
         total_size = int(response.headers.get('content-length', 0))
         downloaded = 0
         
         async for chunk in response.content.iter_chunked(chunk_size):
             content += chunk
             downloaded += len(chunk)
+            # Сервер мог не прислать content-length — не качаем заведомо лишнее
+            if downloaded > MAX_FILE_SIZE:
+                break
             
             # Показываем прогресс для файлов больше 1MB
             if total_size > 1024 * 1024 and downloaded % (1024 * 1024) == 0:  # Каждый MB
@@ -255,6 +266,11 @@ class DocumentDownloader:
                 })
         return files
     
+    def count_files(self) -> int:
+        """Считает записи в папке загрузок без построения списка"""
+        with os.scandir(self.download_dir) as entries:
+            return sum(1 for _ in entries)
+    
     def cleanup_old_files(self, max_age_hours: int = 24) -> int:
         """Удаляет старые файлы для экономии места"""
         import time
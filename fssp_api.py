@@ -227,11 +227,10 @@ class FSSPAPIClient:
             # В API-ФССП данные возвращаются в виде словаря с ИНН как ключом
             # Извлекаем ИНН из ключей данных
             if isinstance(data, dict):
-                inn_keys = [key for key in data.keys() if key.isdigit() and len(key) in [10, 12]]
-                if inn_keys:
-                    result['inn'] = inn_keys[0]
-                else:
-                    result['inn'] = 'Не указано'
+                result['inn'] = next(
+                    (key for key in data if key.isdigit() and len(key) in (10, 12)),
+                    'Не указано'
+                )
             else:
                 result['inn'] = 'Не указано'
             
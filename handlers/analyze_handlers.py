@@ -7,6 +7,7 @@ from utils.validators import extract_tender_info_from_url
 from config import TENDERGURU_API_CODE
 from navigation_utils import handle_navigation_buttons
 from company_profile import build_company_profile
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
@@ -56,7 +57,9 @@ async def analyze_tender_handler(update: Update, context: ContextTypes.DEFAULT_T
     logger.info(f"[analyze_tender_handler] Сохраняем в context.user_data: last_tender_number={tender_number}, last_platform_code={platform_code}")
     await message.reply_text("🔍 Ищу тендер по номеру...")
     try:
-        tender_data = get_tender_by_number(tender_number, platform_code)
+        # Синхронный запрос к TenderGuru — в пуле потоков, чтобы не останавливать остальные чаты
+        loop = asyncio.get_event_loop()
+        tender_data = await loop.run_in_executor(None, get_tender_by_number, tender_number, platform_code)
         logger.info(f"[analyze_tender_handler] get_tender_by_number({tender_number}, {platform_code}) вернул: {tender_data}")
     except Exception as e:
         await message.reply_text(f"❌ Ошибка обращения к TenderGuru API: {e}")
@@ -185,9 +188,12 @@ async def handle_tender_card_callback(update: Update, context: ContextTypes.DEFA
             analyze_func = getattr(analyzer, 'analyze_tender_text', None)
             if analyze_func and callable(analyze_func):
                 text = get('TorgiName', '') + '\n' + (get('Info', '') or '')
-                analysis = analyze_func(text)
-                if hasattr(analysis, '__await__'):
-                    analysis = await analysis
+                if asyncio.iscoroutinefunction(analyze_func):
+                    analysis = await analyze_func(text)
+                else:
+                    # Синхронный анализатор — в пуле потоков, чтобы не останавливать остальные чаты
+                    loop = asyncio.get_event_loop()
+                    analysis = await loop.run_in_executor(None, analyze_func, text)
             else:
                 analysis = "(Анализатор не реализован)"
         except Exception as e:
@@ -199,7 +205,9 @@ async def handle_tender_card_callback(update: Update, context: ContextTypes.DEFA
         customer = get('Customer', '—')
         customer_inn = get('CustomerInn', '—')
         try:
-            profile = await build_company_profile(customer_inn)
+            # build_company_profile синхронный и ходит в сеть — выполняем в пуле потоков
+            loop = asyncio.get_event_loop()
+            profile = await loop.run_in_executor(None, build_company_profile, customer_inn)
         except Exception as e:
             profile = f"Ошибка получения профиля: {e}"
         await query.edit_message_text(f"🦾 Заказчик: {customer}\nИНН: {customer_inn}\nПрофиль:\n{profile}")
@@ -209,7 +217,9 @@ async def handle_tender_card_callback(update: Update, context: ContextTypes.DEFA
         try:
             api = TenderGuruAPI(TENDERGURU_API_CODE)
             kwords = get('TorgiName') or get('ContractName') or ''
-            similar = api.get_tenders_by_keywords(kwords)
+            # Синхронный запрос requests — в пуле потоков
+            loop = asyncio.get_event_loop()
+            similar = await loop.run_in_executor(None, api.get_tenders_by_keywords, kwords)
             tenders = similar.get('results', [])
             msg = '\n'.join([f"• {t.get('TorgiName', t.get('ContractName', '—'))} | {t.get('Price', '—')} ₽ | {t.get('EndTime', '—')}" for t in tenders[:5] if isinstance(t, dict)])
         except Exception as e:
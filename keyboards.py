@@ -110,6 +110,86 @@ history_keyboard = InlineKeyboardMarkup([
     [InlineKeyboardButton("⬅️ В меню", callback_data=BACK_CB)],
 ])
 
+# Статичные клавиатуры разделов бота: создаются один раз при импорте
+tender_actions_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📄 Подробный анализ", callback_data="analyze")],
+    [InlineKeyboardButton("📦 Позиции", callback_data="products_0")],
+    [InlineKeyboardButton("📎 Документы", callback_data="documents_0")],
+    [InlineKeyboardButton("📈 История тендеров", callback_data="history")],
+    [InlineKeyboardButton("🔍 Найти поставщиков", callback_data="find_suppliers")],
+])
+back_to_main_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Назад", callback_data="back_to_main")],
+])
+supplier_check_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🏛️ Проверка ФНС", callback_data="fns_check")],
+    [InlineKeyboardButton("⚖️ Арбитражные дела", callback_data="arbitr_check")],
+    [InlineKeyboardButton("📈 Скоринг", callback_data="scoring_check")],
+    [InlineKeyboardButton("👮 Проверка ФССП", callback_data="fssp_check")],
+    [InlineKeyboardButton("🔙 Главное меню", callback_data="back_to_main")],
+])
+inn_check_back_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 К проверке контрагентов", callback_data="back_to_supplier_check")],
+    [InlineKeyboardButton("🏠 Главное меню", callback_data="back_to_main")],
+])
+buy_subscription_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📧 Написать в поддержку", callback_data="contact_support")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="profile")],
+])
+extend_subscription_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("💳 Оплатить с баланса", callback_data="pay_from_balance")],
+    [InlineKeyboardButton("📧 Написать в поддержку", callback_data="contact_support")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="profile")],
+])
+referral_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📤 Поделиться ссылкой", callback_data="share_ref_link")],
+    [InlineKeyboardButton("📊 Статистика рефералов", callback_data="ref_statistics")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="profile")],
+])
+back_to_profile_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Назад", callback_data="profile")],
+])
+back_to_extend_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔙 Назад", callback_data="extend_subscription")],
+])
+analysis_actions_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔍 Найти поставщиков", callback_data="find_suppliers")],
+    [InlineKeyboardButton("⚠️ Проверить риски", callback_data="check_risks")],
+    [InlineKeyboardButton("📊 Показать похожие закупки", callback_data="history")],
+])
+
+# Клавиатуры админ панели
+admin_panel_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("👥 Пользователи", callback_data="admin_users")],
+    [InlineKeyboardButton("📊 Статистика", callback_data="admin_statistics")],
+    [InlineKeyboardButton("⚙️ Настройки", callback_data="admin_settings")],
+    [InlineKeyboardButton("📋 Логи", callback_data="admin_logs")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="profile")],
+])
+admin_users_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Подробная статистика", callback_data="admin_users_detailed")],
+    [InlineKeyboardButton("🔍 Поиск пользователя", callback_data="admin_search_user")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")],
+])
+admin_statistics_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📅 По дням", callback_data="admin_stats_daily")],
+    [InlineKeyboardButton("📊 По функциям", callback_data="admin_stats_functions")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")],
+])
+admin_settings_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🔧 Изменить лимиты", callback_data="admin_change_limits")],
+    [InlineKeyboardButton("🔄 Перезапустить API", callback_data="admin_restart_api")],
+    [InlineKeyboardButton("🧹 Очистить кэш", callback_data="admin_clear_cache")],
+    [InlineKeyboardButton("📋 Системные логи", callback_data="admin_system_logs")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")],
+])
+admin_logs_keyboard = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📄 Полные логи", callback_data="admin_full_logs")],
+    [InlineKeyboardButton("🔍 Поиск по логам", callback_data="admin_search_logs")],
+    [InlineKeyboardButton("🧹 Очистить логи", callback_data="admin_clear_logs")],
+    [InlineKeyboardButton("🔙 Назад", callback_data="admin_panel")],
+])
+
 back_keyboard = ReplyKeyboardMarkup([[KeyboardButton('🔙 Назад')]], resize_keyboard=True)
 main_menu_keyboard = ReplyKeyboardMarkup([
     [KeyboardButton('📦 Анализ тендера'), KeyboardButton('🦾 Проверка компании')],
@@ -20,7 +20,7 @@ def handle_navigation_buttons(update, main_menu_keyboard, bot_instance) -> bool:
     if text == '🏠 В главное меню':
         if user_id in bot_instance.user_sessions:
             bot_instance.user_sessions[user_id]['state'] = 'MAIN_MENU'
-            bot_instance.user_sessions[user_id]['status'] = 'waiting_for_tender'
+            bot_instance.set_status(user_id, 'waiting_for_tender')
         message.reply_text(
             "Главное меню:",
             reply_markup=main_menu_keyboard
@@ -33,7 +33,7 @@ def handle_navigation_buttons(update, main_menu_keyboard, bot_instance) -> bool:
                 bot_instance.user_sessions[user_id]['state'] = state.replace('WAIT_', '')
             else:
                 bot_instance.user_sessions[user_id]['state'] = 'MAIN_MENU'
-                bot_instance.user_sessions[user_id]['status'] = 'waiting_for_tender'
+                bot_instance.set_status(user_id, 'waiting_for_tender')
         message.reply_text(
             "Вы вернулись назад.",
             reply_markup=main_menu_keyboard
@@ -1,9 +1,16 @@
 import requests
+import time
+from collections import OrderedDict
 from typing import Optional, List, Dict, Any
 from config import TENDERGURU_API_CODE
 
 BASE_URL = "https://www.tenderguru.ru/api2.3/export"
 
+# Кэш карточек тендеров: пользователи часто повторно отправляют один и тот же номер
+TENDER_CACHE_TTL = 300  # секунды
+TENDER_CACHE_MAXSIZE = 512
+_tender_cache: "OrderedDict[tuple, tuple[float, dict]]" = OrderedDict()
+
 class TenderGuruAPI:
     def __init__(self, api_code: str):
         self.api_code = api_code
@@ -113,6 +120,22 @@ def format_tender_history(tender_data: dict) -> str:
     return '\n'.join(lines)
 
 def get_tender_by_number(tender_number: str, platform_code: Optional[str] = None) -> dict:
+    key = (tender_number, platform_code)
+    cached = _tender_cache.get(key)
+    if cached and time.monotonic() - cached[0] < TENDER_CACHE_TTL:
+        _tender_cache.move_to_end(key)
+        return cached[1]
+    result = _fetch_tender_by_number(tender_number, platform_code)
+    # Ошибки и пустые ответы («не найден») не кэшируем: следующий запрос может
+    # пройти успешно, а только что опубликованный тендер — уже найтись
+    if isinstance(result, dict) and 'error' not in result and result.get('results'):
+        _tender_cache[key] = (time.monotonic(), result)
+        _tender_cache.move_to_end(key)
+        if len(_tender_cache) > TENDER_CACHE_MAXSIZE:
+            _tender_cache.popitem(last=False)
+    return result
+
+def _fetch_tender_by_number(tender_number: str, platform_code: Optional[str] = None) -> dict:
     url = f"https://www.tenderguru.ru/api2.3/export"
     params = {
         'tend_num': tender_number,
@@ -72,4 +72,184 @@ analytics_invalid_text = "❌ Ошибка в параметрах аналит
 profile_invalid_text = "❌ Ошибка в данных профиля. Проверьте ввод."
 email_invalid_text = "❌ Не удалось сгенерировать письмо. Попробуйте ещё раз."
 tooltip_first_start = "ℹ️ Используйте главное меню для выбора действия. Бот подскажет на каждом шаге!"
-tooltip_error_repeat = "💡 Если не получается — проверьте пример выше или вернитесь в меню." 
\ No newline at end of file
+tooltip_error_repeat = "💡 Если не получается — проверьте пример выше или вернитесь в меню." 
+
+start_text = (
+    "Привет! Я TenderBot – анализирую тендеры, проверяю компании и нахожу похожие закупки.\n\n"
+    "Выберите нужный раздел или отправьте номер тендера / ИНН."
+)
+help_command_text = (
+    "Я TenderBot – анализирую тендеры, проверяю компании и нахожу похожие закупки.\n\n"
+    "Выберите нужный раздел или отправьте номер тендера / ИНН."
+)
+status_text_template = """
+🔧 **Статус TenderBot**
+
+**Время работы:** {now}
+**Версия:** 2.0.0
+**Статус:** ✅ Работает
+
+**API статус:**
+• DaMIA API: ✅ Доступен
+• OpenAI API: ✅ Доступен
+
+**Статистика:**
+• Обработано тендеров: {sessions}
+• Скачано файлов: {files}
+
+**Система:**
+• Логирование: ✅ Активно
+• VPN для OpenAI: ✅ Настроен
+• Очистка файлов: ✅ Автоматическая
+        """
+
+buy_subscription_text = """
+💳 **Покупка подписки**
+
+**Доступные тарифы:**
+
+🥉 **Базовый** - 999 руб/месяц
+• 100 запросов в день
+• Проверка контрагентов
+• Анализ тендеров
+• Базовая поддержка
+
+🥈 **Стандарт** - 1999 руб/месяц
+• 300 запросов в день
+• Все функции базового
+• Приоритетная поддержка
+• Экспорт отчетов
+
+🥇 **Премиум** - 3999 руб/месяц
+• Безлимитные запросы
+• Все функции стандарта
+• Персональный менеджер
+• API доступ
+• Белый лейбл
+
+**Для покупки свяжитесь с менеджером:**
+📧 support@tenderbot.ru
+📱 +7 (999) 123-45-67
+        """
+
+contact_support_text = """
+📧 **Контакты поддержки**
+
+Если у вас возникли вопросы или проблемы, пожалуйста, свяжитесь с нами:
+📧 support@tenderbot.ru
+📱 +7 (999) 123-45-67
+        """
+
+pay_from_balance_text = """
+💳 **Оплата с баланса**
+
+Вы можете оплатить подписку с вашего баланса. Пожалуйста, введите сумму для оплаты:
+        """
+
+admin_panel_text = """
+👨‍💼 **Панель администратора**
+
+Выберите нужный раздел:
+        """
+
+admin_settings_text = """
+⚙️ **Настройки системы**
+
+**Текущие параметры:**
+• Дневной лимит запросов: 100
+• Максимальный размер файла: 50MB
+• Время жизни кэша: 1 час
+• Максимальные попытки API: 3
+
+**API статус:**
+• DaMIA API: ✅ Активен
+• OpenAI API: ✅ Активен
+• SerpAPI: ✅ Активен
+• FNS API: ✅ Активен
+• Arbitr API: ✅ Активен
+• Scoring API: ✅ Активен
+• FSSP API: ✅ Активен
+
+**Системные параметры:**
+• Логирование: ✅ Включено
+• VPN для OpenAI: ✅ Настроен
+• Автоочистка файлов: ✅ Включена
+        """
+
+extend_subscription_text_template = """
+🔄 **Продление подписки**
+
+**Текущая подписка:**
+📅 Истекает: {subscription_expires}
+💰 Баланс: {balance} руб.
+
+**Варианты продления:**
+
+🥉 **Базовый** - 999 руб/месяц
+🥈 **Стандарт** - 1999 руб/месяц  
+🥇 **Премиум** - 3999 руб/месяц
+
+**Для продления:**
+📧 support@tenderbot.ru
+📱 +7 (999) 123-45-67
+
+**Или используйте баланс аккаунта**
+        """
+
+referral_text_template = """
+👥 **Реферальная система**
+
+**Ваша реферальная ссылка:**
+`{ref_link}`
+
+**Как это работает:**
+• Пригласите друзей по ссылке
+• За каждого приглашенного получаете 100 руб.
+• Приглашенный получает 50 руб. на баланс
+• Реферальные средства можно тратить на подписку
+
+**Ваша статистика:**
+💳 Реферальный баланс: {ref_balance} руб.
+👥 Приглашено пользователей: {ref_count}
+🎁 Заработано всего: {ref_balance} руб.
+
+**Условия:**
+• Реферал должен зарегистрироваться по вашей ссылке
+• Реферал должен совершить первую покупку
+• Бонусы начисляются в течение 24 часов
+        """
+
+share_ref_link_text_template = """
+📤 **Поделиться ссылкой**
+
+Вы можете поделиться своей реферальной ссылкой с друзьями:
+`{ref_link}`
+
+**Как это работает:**
+• Пригласите друзей по ссылке
+• За каждого приглашенного получаете 100 руб.
+• Приглашенный получает 50 руб. на баланс
+• Реферальные средства можно тратить на подписку
+
+**Ваша статистика:**
+💳 Реферальный баланс: {ref_balance} руб.
+👥 Приглашено пользователей: {ref_count}
+🎁 Заработано всего: {ref_balance} руб.
+
+**Условия:**
+• Реферал должен зарегистрироваться по вашей ссылке
+• Реферал должен совершить первую покупку
+• Бонусы начисляются в течение 24 часов
+        """
+
+ref_statistics_text_template = """
+📊 **Статистика рефералов**
+
+👥 Приглашено пользователей: {ref_count}
+🎁 Заработано всего: {ref_balance} руб.
+
+**Условия:**
+• Реферал должен зарегистрироваться по вашей ссылке
+• Реферал должен совершить первую покупку
+• Бонусы начисляются в течение 24 часов
+        """
@@ -6,6 +6,8 @@ STOPWORDS = [
     'тендер', 'закупка', 'госзакупка', 'государственный', 'лот', 'номер', 'поиск',
     'пример', 'sample', 'test', 'тест', 'demo', 'демо'
 ]
+# Одна регулярка вместо цикла по стоп-словам; IGNORECASE избавляет от копии text.lower()
+_STOPWORDS_RE = re.compile('|'.join(map(re.escape, STOPWORDS)), re.IGNORECASE)
 
 PLATFORM_MAPPING = {
     "sberbank-ast.ru": "e1",
@@ -59,12 +61,11 @@ def is_valid_tender_number(text: str):
     return False, "Не удалось извлечь номер тендера из ссылки. Отправьте корректный номер или ссылку."
 
 def is_valid_keywords(text: str):
-    text = text.strip().lower()
+    text = text.strip()
     if len(text) < 2 or text.isdigit():
         return False, "Ключевые слова должны содержать минимум 2 буквы."
-    for stop in STOPWORDS:
-        if stop in text:
-            return False, "Не используйте слова 'тендер', 'закупка' и т.п."
+    if _STOPWORDS_RE.search(text):
+        return False, "Не используйте слова 'тендер', 'закупка' и т.п."
     if not any(c.isalpha() for c in text):
         return False, "Ключевые слова должны содержать буквы."
     return True, ""